@@ -1,12 +1,273 @@
 import os
+import shutil
+import subprocess
+import threading
+import wave
+from collections import deque
+import numpy
 import requests
 from pydub import AudioSegment
 from pydub.exceptions import CouldntDecodeError # Specific pydub exception
 import logging
+import config # For FFMPEG_HWACCEL
+
+try:
+    import av # PyAV: in-process libav decode, no subprocess fork per file
+except ImportError:
+    av = None
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Target format expected by whisper.cpp downstream (see config.WHISPER_MODEL_PATH):
+# mono, 16kHz PCM WAV. Converting in one ffmpeg pass avoids a second decode later.
+WHISPER_SAMPLE_RATE = 16000
+
+# Copy-buffer size for streaming the download into ffmpeg. 256KB keeps the
+# per-MB syscall and Python-iteration count low while still fitting
+# comfortably inside the kernel socket buffer / readahead window.
+DOWNLOAD_CHUNK_SIZE = 1 << 18
+
+# Module-level session so sequential episode downloads reuse the same TCP/TLS
+# connection to the feed's CDN instead of paying a fresh handshake per call.
+_SESSION = requests.Session()
+_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8))
+_SESSION.mount('http://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
+# Cached result of probing `ffmpeg -hwaccels`; None until first probed.
+_HWACCEL_AVAILABLE: bool | None = None
+
+def _hwaccel_args() -> list[str]:
+    """
+    Returns the ffmpeg hardware-acceleration arguments for the configured
+    FFMPEG_HWACCEL method, probing availability once per process via
+    `ffmpeg -hwaccels`. Falls back to software decode (empty list) silently
+    when the method is unavailable or probing fails.
+    """
+    global _HWACCEL_AVAILABLE
+    hwaccel = getattr(config, 'FFMPEG_HWACCEL', 'none')
+    if not hwaccel or hwaccel == 'none':
+        return []
+
+    if _HWACCEL_AVAILABLE is None:
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-hwaccels"],
+                capture_output=True, text=True, timeout=10,
+            )
+            available_methods = result.stdout.lower().split()
+            _HWACCEL_AVAILABLE = result.returncode == 0 and hwaccel in available_methods
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Could not probe ffmpeg hardware acceleration support: {e}")
+            _HWACCEL_AVAILABLE = False
+        if not _HWACCEL_AVAILABLE:
+            logger.warning(f"FFmpeg hwaccel method '{hwaccel}' not available. Using software decode.")
+
+    return ["-hwaccel", hwaccel] if _HWACCEL_AVAILABLE else []
+
+class _StderrDrain(threading.Thread):
+    """
+    Reads a subprocess stderr pipe to EOF on a background thread, keeping
+    only a bounded tail for error reporting. Without a concurrent reader,
+    ffmpeg blocks once its stderr fills the ~64KB pipe buffer (per-packet
+    decode errors get through -loglevel error on corrupt input), stops
+    consuming stdin / producing stdout, and deadlocks the streaming loop.
+    """
+    def __init__(self, pipe, max_bytes: int = 1 << 16):
+        super().__init__(daemon=True)
+        self.pipe = pipe
+        self.max_bytes = max_bytes
+        self.chunks = deque()
+        self.total = 0
+        self.start()
+
+    def run(self):
+        try:
+            while True:
+                chunk = self.pipe.read(8192)
+                if not chunk:
+                    break
+                self.chunks.append(chunk)
+                self.total += len(chunk)
+                while self.total > self.max_bytes and len(self.chunks) > 1:
+                    self.total -= len(self.chunks.popleft())
+        except (OSError, ValueError):
+            pass
+
+    def output(self) -> str:
+        """Joins the reader and returns the retained stderr tail as text."""
+        self.join()
+        return b''.join(self.chunks).decode(errors="replace")
+
+def _ffmpeg_command(input_source: str, output_wav_path: str) -> list[str]:
+    """Builds the ffmpeg command converting input_source to mono 16kHz WAV."""
+    return [
+        "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+        *_hwaccel_args(),
+        "-i", input_source,
+        "-vn", # Podcast MP3s often embed cover art; don't decode it
+        "-ac", "1",
+        "-ar", str(WHISPER_SAMPLE_RATE),
+        "-f", "wav",
+        "-threads", "0", # Let ffmpeg pick its own thread count
+        output_wav_path,
+    ]
+
+def _pyav_decode_to_wav(input_audio_path: str, output_wav_path: str) -> None:
+    """
+    Decodes an audio file to mono 16kHz WAV using PyAV's in-process libav
+    bindings — no subprocess fork and no pydub in-memory copy.
+
+    Raises:
+        av.AVError (or OSError) if the input cannot be decoded.
+    """
+    resampler = av.AudioResampler(format='s16', layout='mono', rate=WHISPER_SAMPLE_RATE)
+    with av.open(input_audio_path) as container:
+        stream = container.streams.audio[0]
+        # Each resampled frame is only a few KB; a 1MB buffer between wave
+        # and the file turns thousands of per-frame write() syscalls into a
+        # handful of large ones (same trick as the download temp file).
+        with open(output_wav_path, 'wb', buffering=1 << 20) as raw_out, \
+             wave.open(raw_out, 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(WHISPER_SAMPLE_RATE)
+            for frame in container.decode(stream):
+                for resampled in resampler.resample(frame):
+                    out.writeframes(resampled.to_ndarray().tobytes())
+            for resampled in resampler.resample(None): # flush the resampler
+                out.writeframes(resampled.to_ndarray().tobytes())
+
+def _pydub_fallback_convert(audio_url: str, output_wav_path: str) -> str | None:
+    """
+    Fallback conversion path: re-downloads the audio to a temporary file and
+    decodes it in-process with PyAV (or pydub when PyAV is unavailable),
+    which can sometimes recover from containers with damaged headers that
+    ffmpeg refuses when reading from a pipe.
+
+    Returns:
+        The path to the saved WAV file if successful, None otherwise.
+    """
+    temp_audio_file_path = output_wav_path + ".download"
+    try:
+        logger.info(f"Re-downloading audio from {audio_url} to {temp_audio_file_path} for pydub fallback.")
+        response = _SESSION.get(audio_url, stream=True, timeout=30)
+        response.raise_for_status()
+        # A large userspace buffer coalesces the download chunks into far
+        # fewer write() syscalls for this temp file.
+        response.raw.decode_content = True
+        with open(temp_audio_file_path, 'wb', buffering=1 << 20) as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+
+        if av is not None:
+            try:
+                _pyav_decode_to_wav(temp_audio_file_path, output_wav_path)
+                logger.info(f"Audio converted and saved to WAV (PyAV fallback): {output_wav_path}")
+                return output_wav_path
+            except av.FFmpegError as e:
+                logger.warning(f"PyAV could not decode {temp_audio_file_path} ({e}). Trying pydub.")
+
+        audio_segment = AudioSegment.from_file(temp_audio_file_path)
+        audio_segment.export(output_wav_path, format="wav")
+        logger.info(f"Audio converted and saved to WAV (pydub fallback): {output_wav_path}")
+        return output_wav_path
+    except requests.exceptions.RequestException as e:
+        logger.exception(f"Error re-downloading audio from {audio_url} for pydub fallback: {e}")
+        return None
+    except CouldntDecodeError as e:
+        logger.exception(f"Pydub CouldntDecodeError on fallback for {temp_audio_file_path}. Might be corrupted or unsupported format. Error: {e}")
+        return None
+    except FileNotFoundError: # Handle missing ffmpeg/ffprobe during pydub conversion too
+        logger.exception("FFmpeg/FFprobe not found during pydub fallback conversion. Ensure they are installed and in PATH.")
+        return None
+    except OSError as e_os: # Catch other OS errors during fallback conversion
+        logger.exception(f"OSError during pydub fallback conversion for {temp_audio_file_path}: {e_os}")
+        return None
+    finally:
+        if os.path.exists(temp_audio_file_path):
+            try:
+                os.remove(temp_audio_file_path)
+            except OSError as e:
+                logger.exception(f"Error deleting temporary audio file {temp_audio_file_path}: {e}")
+
+def process_audio_to_array(audio_url: str) -> numpy.ndarray | None:
+    """
+    Downloads audio from a URL and decodes it straight to mono 16kHz float32
+    samples in memory, skipping the WAV file round-trip entirely.
+
+    Intended for transcription backends that accept raw PCM arrays directly;
+    the whisper.cpp subprocess path still goes through process_audio, which
+    needs a WAV file on disk.
+
+    Returns:
+        A 1-D numpy.float32 array of samples in [-1.0, 1.0], or None on error.
+    """
+    logger.info(f"Decoding audio from {audio_url} to raw PCM in memory.")
+    try:
+        response = _SESSION.get(audio_url, stream=True, timeout=30)
+        response.raise_for_status()
+
+        command = [
+            "ffmpeg", "-hide_banner", "-loglevel", "error",
+            *_hwaccel_args(),
+            "-i", "pipe:0",
+            "-ac", "1",
+            "-ar", str(WHISPER_SAMPLE_RATE),
+            "-f", "s16le",
+            "pipe:1",
+        ]
+        proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+
+        stderr_drain = _StderrDrain(proc.stderr)
+
+        # Feed the download from a helper thread while this thread drains
+        # stdout, so neither pipe can fill up and deadlock the other.
+        def _feed_stdin():
+            try:
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, proc.stdin, length=DOWNLOAD_CHUNK_SIZE)
+            except (BrokenPipeError, OSError):
+                pass # ffmpeg exited early; return code is inspected below
+            finally:
+                try:
+                    proc.stdin.close()
+                except (BrokenPipeError, OSError):
+                    pass
+
+        feeder = threading.Thread(target=_feed_stdin, daemon=True)
+        feeder.start()
+        pcm_bytes = proc.stdout.read()
+        returncode = proc.wait()
+        feeder.join()
+        stderr_output = stderr_drain.output()
+
+        if returncode != 0:
+            logger.error(f"ffmpeg failed with return code {returncode} while decoding {audio_url} to PCM")
+            logger.error(f"ffmpeg stderr:\n{stderr_output}")
+            return None
+
+        samples = numpy.frombuffer(pcm_bytes, dtype=numpy.int16).astype(numpy.float32) / 32768.0
+        logger.info(f"Decoded {len(samples)} samples ({len(samples) / WHISPER_SAMPLE_RATE:.1f}s) from {audio_url}")
+        return samples
+
+    except requests.exceptions.Timeout:
+        logger.exception(f"Timeout while downloading audio from {audio_url}")
+        return None
+    except requests.exceptions.RequestException as e:
+        logger.exception(f"Error downloading audio from {audio_url}: {e}")
+        return None
+    except FileNotFoundError:
+        logger.exception("FFmpeg not found. Ensure it is installed and in PATH.")
+        return None
+    except Exception as e:
+        logger.exception(f"Unexpected error decoding audio from {audio_url} to PCM: {e}")
+        return None
+
 def process_audio(audio_url: str, output_wav_path: str) -> str | None:
     """
     Downloads audio from a URL, converts it to WAV format, and saves it.
@@ -21,26 +282,52 @@ def process_audio(audio_url: str, output_wav_path: str) -> str | None:
     logger.info(f"Starting audio processing for URL: {audio_url} -> {output_wav_path}")
 
     output_dir = os.path.dirname(output_wav_path)
-    if output_dir and not os.path.exists(output_dir): # Check if output_dir is not empty
+    if output_dir: # Check if output_dir is not empty
         try:
-            os.makedirs(output_dir)
-            logger.info(f"Created output directory: {output_dir}")
+            # exist_ok collapses the old exists()+makedirs pair into one call.
+            os.makedirs(output_dir, exist_ok=True)
         except OSError as e:
             logger.exception(f"Error creating output directory {output_dir}: {e}")
             return None
 
-    # Define a more unique temporary file path
-    temp_audio_file_path = os.path.join(output_dir if output_dir else ".", f"temp_download_{os.path.basename(output_wav_path)}")
-
     try:
-        logger.info(f"Downloading audio from {audio_url} to {temp_audio_file_path}")
-        response = requests.get(audio_url, stream=True, timeout=30) # Added timeout
+        logger.info(f"Streaming audio from {audio_url} into ffmpeg -> {output_wav_path}")
+        response = _SESSION.get(audio_url, stream=True, timeout=30) # Added timeout
         response.raise_for_status()
 
-        with open(temp_audio_file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        logger.info(f"Audio downloaded successfully to {temp_audio_file_path}")
+        # Pipe the download straight into ffmpeg's stdin: no temporary file,
+        # so the audio bytes cross the filesystem exactly once (the WAV output).
+        proc = subprocess.Popen(
+            _ffmpeg_command("pipe:0", output_wav_path),
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        stderr_drain = _StderrDrain(proc.stderr)
+        try:
+            # copyfileobj runs the read/write loop in C, skipping the
+            # per-chunk generator hop of iter_content.
+            response.raw.decode_content = True
+            shutil.copyfileobj(response.raw, proc.stdin, length=DOWNLOAD_CHUNK_SIZE)
+        except BrokenPipeError:
+            # ffmpeg exited early (e.g. undecodable input); its stderr and
+            # return code are inspected below.
+            logger.warning("ffmpeg closed its input pipe early while streaming download.")
+        finally:
+            try:
+                proc.stdin.close()
+            except (BrokenPipeError, OSError):
+                pass
+        returncode = proc.wait()
+        stderr_output = stderr_drain.output()
+
+        if returncode != 0:
+            logger.error(f"ffmpeg failed with return code {returncode} while streaming {audio_url}")
+            logger.error(f"ffmpeg stderr:\n{stderr_output}")
+            logger.warning("Streaming ffmpeg conversion failed. Falling back to pydub via temporary file.")
+            return _pydub_fallback_convert(audio_url, output_wav_path)
+
+        logger.info(f"Audio successfully converted and saved to WAV: {output_wav_path}")
+        return output_wav_path
 
     except requests.exceptions.Timeout:
         logger.exception(f"Timeout while downloading audio from {audio_url}")
@@ -48,53 +335,15 @@ def process_audio(audio_url: str, output_wav_path: str) -> str | None:
     except requests.exceptions.RequestException as e:
         logger.exception(f"Error downloading audio from {audio_url}: {e}")
         return None
-    except IOError as e:
-        logger.exception(f"IOError saving downloaded audio to {temp_audio_file_path}: {e}")
-        return None
-
-    try:
-        logger.info(f"Converting {temp_audio_file_path} to WAV format at {output_wav_path}.")
-        audio_segment = AudioSegment.from_file(temp_audio_file_path)
-        audio_segment.export(output_wav_path, format="wav")
-        logger.info(f"Audio successfully converted and saved to WAV: {output_wav_path}")
-        return output_wav_path
-
-    except CouldntDecodeError as e:
-        logger.exception(f"Pydub CouldntDecodeError: Failed to decode audio from {temp_audio_file_path}. Might be corrupted or unsupported format. Error: {e}")
-        # Attempting explicit format conversion as a fallback (e.g. if it was MP3)
-        try:
-            logger.info(f"Retrying conversion by explicitly assuming MP3 format for {temp_audio_file_path}.")
-            audio_segment = AudioSegment.from_mp3(temp_audio_file_path)
-            audio_segment.export(output_wav_path, format="wav")
-            logger.info(f"Audio converted and saved to WAV (after explicit MP3): {output_wav_path}")
-            return output_wav_path
-        except CouldntDecodeError as e2: # Catch specific error for the fallback too
-            logger.exception(f"Pydub CouldntDecodeError on retry (assuming MP3) for {temp_audio_file_path}: {e2}")
-            return None
-        except FileNotFoundError: # Handle missing ffmpeg during explicit conversion too
-            logger.exception("FFmpeg/FFprobe not found during pydub MP3 conversion. Ensure they are installed and in PATH.")
-            return None
-        except OSError as e_os_mp3: # Catch other OS errors during explicit conversion
-            logger.exception(f"OSError during explicit MP3 conversion for {temp_audio_file_path}: {e_os_mp3}")
-            return None
-
-    except FileNotFoundError: # Typically indicates ffmpeg/ffprobe not found or not executable
-        logger.exception("FFmpeg/FFprobe not found. Ensure they are installed and in PATH for pydub processing.")
+    except FileNotFoundError: # The ffmpeg executable itself was not found
+        logger.exception("FFmpeg not found. Ensure it is installed and in PATH.")
         return None
     except OSError as e_os: # Catch other OS-related errors (e.g. permissions, disk full during export)
-         logger.exception(f"OSError during pydub processing for {temp_audio_file_path}: {e_os}")
+         logger.exception(f"OSError during streaming ffmpeg conversion for {audio_url}: {e_os}")
          return None
-    except Exception as e: # Catch-all for any other unexpected pydub errors
-        logger.exception(f"Unexpected error converting {temp_audio_file_path} to WAV: {e}")
+    except Exception as e: # Catch-all for any other unexpected conversion errors
+        logger.exception(f"Unexpected error converting audio from {audio_url} to WAV: {e}")
         return None
-            
-    finally:
-        if os.path.exists(temp_audio_file_path):
-            try:
-                os.remove(temp_audio_file_path)
-                logger.info(f"Temporary audio file {temp_audio_file_path} deleted successfully.")
-            except OSError as e:
-                logger.exception(f"Error deleting temporary audio file {temp_audio_file_path}: {e}")
 
 if __name__ == '__main__':
     # This is for testing the module directly
@@ -0,0 +1,55 @@
+import os
+import logging
+from celery import Celery
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Broker/backend URL; override via REDIS_URL in .env for non-local deployments.
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+
+celery_app = Celery('allinapp', broker=REDIS_URL, backend=REDIS_URL)
+
+celery_app.conf.update(
+    # msgpack is binary: ~2-3x smaller and faster to encode/decode than JSON
+    # for the multi-KB output/traceback strings the pipeline result carries.
+    # json stays in accept_content so in-flight tasks from older deployments
+    # are still consumable during a rolling upgrade.
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
+    # Pipeline results are mostly log text, which compresses very well.
+    result_compression="gzip",
+    # The podcast pipeline task runs for minutes. With the default greedy
+    # prefetch a long task can sit queued behind a busy worker while another
+    # worker is idle; prefetching one task at a time (combined with launching
+    # the worker with -Ofair, see below) dispatches work only to child
+    # processes that are actually free.
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    # Extended metadata (name, args, ...) arrives in the same single GET the
+    # status route performs via backend.get_task_meta().
+    result_extended=True,
+    # Transcription is the heavy compute phase; give it its own queue so it
+    # can be pinned to beefy (or GPU) hosts while I/O phases run anywhere.
+    # Show art gets a separate gpu queue: run its worker on the GPU box with
+    #   celery -A tasks worker -Q gpu --concurrency=1 --pool=solo
+    # so the Stable Diffusion weights are loaded once into a single process
+    # that owns the GPU, instead of into every pipeline worker child.
+    task_routes={
+        'tasks.transcribe': {'queue': 'transcription'},
+        'tasks.generate_art': {'queue': 'gpu'},
+    },
+)
+
+# Launch workers from the AllInApp directory (the modules use flat imports)
+# with the tasks module as the app so all tasks get registered. The main
+# worker must consume the transcription queue alongside the default one, or
+# chained/backfill dispatches stall after the download phase with nothing
+# listening:
+#   celery -A tasks worker -l info -Ofair -Q celery,transcription
+# -Ofair disables the default round-robin task handoff so that, together with
+# worker_prefetch_multiplier=1 above, a long-running pipeline task never
+# queues behind an already-busy child process. Hosts with a dedicated
+# transcription box can instead split the queues across workers.
@@ -26,10 +26,34 @@ PROCESSED_JSON = os.path.join(DATA_DIR, 'processed.json') # To track processed e
 # FAISS index and past lessons store for NLP context building
 FAISS_INDEX_PATH = os.path.join(DATA_DIR, 'faiss_index.bin')
 PAST_LESSONS_PATH = os.path.join(DATA_DIR, 'past_lessons.json')
+# Per-lesson embedding memo (see embedding_cache.py)
+EMBEDDING_CACHE_PATH = os.path.join(DATA_DIR, 'embedding_cache.npz')
 
 # Models paths (placeholders, actual model files will be in models/)
 WHISPER_MODEL_PATH = os.path.join(MODELS_DIR, 'ggml-base.en.bin')
 
+# Optional quantized whisper model, preferred when the file exists: int8/q5
+# inference runs ~1.3-2x faster with negligible accuracy loss. Produce it
+# once with whisper.cpp's quantize tool, e.g.
+#   ./quantize models/ggml-base.en.bin models/ggml-base.en-q8_0.bin q8_0
+WHISPER_MODEL_QUANTIZED_PATH = os.path.join(MODELS_DIR, 'ggml-base.en-q8_0.bin')
+
+# whisper.cpp thread count; defaults to every core on the host.
+WHISPER_THREADS = int(os.getenv('WHISPER_THREADS', '0')) or (os.cpu_count() or 4)
+
+# Transcription backend: 'whisper_cpp' shells out to the compiled binary
+# above; 'faster_whisper' keeps a CTranslate2 int8 model resident in the
+# worker process (see transcription_fw.py; requires pip install faster-whisper).
+TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', 'whisper_cpp')
+FASTER_WHISPER_MODEL = os.getenv('FASTER_WHISPER_MODEL', 'base.en')
+FASTER_WHISPER_COMPUTE_TYPE = os.getenv('FASTER_WHISPER_COMPUTE_TYPE', 'int8')
+
+def preferred_whisper_model() -> str:
+    """Returns the quantized whisper model when present, else the default."""
+    if os.path.exists(WHISPER_MODEL_QUANTIZED_PATH):
+        return WHISPER_MODEL_QUANTIZED_PATH
+    return WHISPER_MODEL_PATH
+
 # Path to the compiled whisper.cpp main executable
 # Assumes whisper.cpp compiled 'main' is in AllInApp/whisper.cpp/main
 WHISPER_CPP_DIR = os.path.join(BASE_DIR, 'whisper.cpp')
@@ -37,13 +61,55 @@ WHISPER_EXECUTABLE_PATH = os.path.join(WHISPER_CPP_DIR, 'main')
 
 # Stable Diffusion settings
 STABLE_DIFFUSION_MODEL_ID = "CompVis/stable-diffusion-v1-4"
+# Denoising steps for show art. With the DPM-Solver++ scheduler, ~20 steps
+# give cover art indistinguishable from the 50-step default at ~2.5x less
+# UNet compute; raise via SHOW_ART_STEPS if artifacts appear.
+SHOW_ART_STEPS = int(os.getenv('SHOW_ART_STEPS', '20'))
+# Opt-out for torch.compile on the UNet (first render pays the compile).
+ENABLE_TORCH_COMPILE = os.getenv('ENABLE_TORCH_COMPILE', '1') == '1'
+# CPU offload for the diffusion sub-models: '1' force on, '0' force off,
+# 'auto' enables it on GPUs with less than ~10GB VRAM. Trades a small
+# per-step transfer cost for fitting on 6-8GB cards.
+SD_ENABLE_CPU_OFFLOAD = os.getenv('SD_ENABLE_CPU_OFFLOAD', 'auto')
 # For other potential models, see Hugging Face Hub, e.g.:
 # STABLE_DIFFUSION_MODEL_ID = "stabilityai/stable-diffusion-xl-base-1.0"
 # STABLE_DIFFUSION_MODEL_ID = "runwayml/stable-diffusion-v1-5"
 
+# FFmpeg hardware acceleration method ('none' disables it).
+# Set FFMPEG_HWACCEL=cuda on GPU hosts to enable NVDEC-backed decode for
+# video-bearing inputs; availability is probed once at first use and the
+# pipeline silently falls back to software decode when unsupported.
+FFMPEG_HWACCEL = os.getenv('FFMPEG_HWACCEL', 'none')
+
 # Other configurations
 PUBLIC_URL = os.getenv('PUBLIC_URL', 'http://localhost:8000/') # Default if not set in .env
 
-# Ensure data and models directories exist
-os.makedirs(DATA_DIR, exist_ok=True)
-os.makedirs(MODELS_DIR, exist_ok=True)
+def atomic_write_text(path, data):
+    """
+    Writes text to path atomically: write a .tmp sibling, then os.replace it
+    into place. Readers never observe a truncated file. fsync is deliberately
+    skipped — these outputs (transcripts, processed-episode lists, lesson
+    stores) are regenerable, so the small crash window is an acceptable trade
+    for not stalling on the metadata journal per episode.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+# Tracks whether ensure_dirs() already ran in this process, so repeated calls
+# (and repeated `import config` across a worker pool) cost no extra syscalls.
+_DIRS_ENSURED = False
+
+def ensure_dirs():
+    """
+    Creates the data and models directories if needed. Called by pipeline
+    entry points rather than at import time, so merely importing this module
+    (e.g. in every forked worker process) issues no filesystem syscalls.
+    """
+    global _DIRS_ENSURED
+    if _DIRS_ENSURED:
+        return
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    _DIRS_ENSURED = True
@@ -0,0 +1,95 @@
+import contextlib
+import hashlib
+import logging
+import os
+
+import numpy
+
+import config
+
+def _inference_ctx():
+    """torch.inference_mode when torch is importable, else a no-op context."""
+    try:
+        import torch
+        return torch.inference_mode()
+    except Exception:
+        return contextlib.nullcontext()
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def get_or_compute(texts: list[str], sentence_model, cache_path: str = None):
+    """
+    Returns float32 embeddings for texts, reusing vectors cached from earlier
+    runs. Lessons recur across episodes (and backlog reprocessing re-embeds
+    identical strings wholesale), so each vector is memoized on disk keyed by
+    the text's sha256; only cache misses pay the SentenceTransformer forward
+    pass. The cache lives in a single .npz next to the other data files and
+    is dropped wholesale when its dimension doesn't match the current model.
+
+    Args:
+        texts: The strings to embed.
+        sentence_model: The loaded SentenceTransformer model.
+        cache_path: Override for config.EMBEDDING_CACHE_PATH (used in tests).
+
+    Returns:
+        A (len(texts), dim) float32 numpy array, rows in input order.
+    """
+    cache_path = cache_path or config.EMBEDDING_CACHE_PATH
+    dimension = sentence_model.get_sentence_embedding_dimension()
+
+    cache = {}
+    try:
+        if os.path.exists(cache_path):
+            with numpy.load(cache_path) as stored:
+                cache = {key: stored[key] for key in stored.files}
+            sample = next(iter(cache.values()), None)
+            if sample is not None and sample.shape[-1] != dimension:
+                logger.warning(
+                    f"Embedding cache dimension ({sample.shape[-1]}) does not match "
+                    f"model dimension ({dimension}); discarding cache."
+                )
+                cache = {}
+    except Exception as e:
+        logger.warning(f"Could not read embedding cache {cache_path}; recomputing. Error: {e}")
+        cache = {}
+
+    keys = [_text_key(text) for text in texts]
+    miss_indices = [i for i, key in enumerate(keys) if key not in cache]
+
+    if miss_indices:
+        # Encode misses in length order so each batch pads to near-uniform
+        # sequence lengths instead of the longest outlier; rows are keyed by
+        # hash, so the original order doesn't need restoring here.
+        miss_indices = sorted(miss_indices, key=lambda i: len(texts[i]))
+        # inference_mode drops autograd bookkeeping that no_grad keeps.
+        with _inference_ctx():
+            computed = numpy.asarray(
+                sentence_model.encode(
+                    [texts[i] for i in miss_indices], batch_size=64,
+                    convert_to_numpy=True, show_progress_bar=False
+                ),
+                dtype=numpy.float32,
+            )
+        for row, i in zip(computed, miss_indices):
+            cache[keys[i]] = row
+        # Atomic rewrite, same pattern as config.atomic_write_text: the cache
+        # is regenerable, so a crash window is fine but a torn file is not.
+        try:
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                numpy.savez(f, **cache)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not persist embedding cache {cache_path}: {e}")
+        logger.info(
+            f"Embedded {len(miss_indices)} of {len(texts)} texts "
+            f"({len(texts) - len(miss_indices)} served from cache)."
+        )
+    else:
+        logger.info(f"All {len(texts)} embeddings served from cache.")
+
+    return numpy.stack([cache[key] for key in keys]).astype(numpy.float32)
@@ -0,0 +1,233 @@
+import os
+import logging
+import uuid
+
+import redis
+from flask import (
+    Flask, Response, flash, jsonify, redirect, request, session,
+    stream_with_context, url_for
+)
+from celery.result import AsyncResult
+from flask.json.provider import DefaultJSONProvider
+from flask_session import Session
+
+try:
+    import orjson # C-accelerated; ~2-5x faster than stdlib json on encode
+except ImportError:
+    orjson = None
+
+from celery_utils import celery_app, REDIS_URL
+from tasks import (
+    PIPELINE_LOCK_KEY, PIPELINE_LOCK_TTL, execute_podcast_pipeline,
+    release_pipeline_lock,
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+app = Flask(__name__)
+# Fixed key from the environment so session cookies survive restarts and are
+# valid across every Flask worker; a fresh random key per process would
+# silently invalidate them. The urandom fallback keeps single-process dev
+# runs working without setup.
+app.secret_key = os.environ.get('ALLINAPP_SECRET') or os.urandom(24)
+# Server-side sessions in Redis (same instance Celery already uses): the
+# cookie carries only a short session id instead of an HMAC-signed payload
+# that grows with task status text, and sessions are shared across multiple
+# Flask workers.
+app.config['SESSION_TYPE'] = 'redis'
+app.config['SESSION_REDIS'] = redis.from_url(REDIS_URL)
+Session(app)
+# The template string below never changes at runtime; don't pay Jinja's
+# auto-reload stat checks per request.
+app.config['TEMPLATES_AUTO_RELOAD'] = False
+app.jinja_env.auto_reload = False
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson. The status endpoint serializes
+    multi-KB log text on every hit; orjson encodes it several times faster
+    than stdlib json and skips the ensure_ascii escape pass. Wire format is
+    unchanged.
+    """
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
+else:
+    logger.info("orjson not installed; using stdlib json for responses.")
+
+html_template = """
+<!doctype html>
+<html>
+<head>
+    <title>All-In Podcast Pipeline</title>
+    <style>
+        body { font-family: sans-serif; margin: 2em; }
+        #status { font-weight: bold; }
+        #log { white-space: pre-wrap; background: #f4f4f4; padding: 1em; }
+        .flash { color: #a00; }
+    </style>
+</head>
+<body>
+    <h1>All-In Podcast Pipeline</h1>
+    {% with messages = get_flashed_messages() %}
+      {% for message in messages %}<p class="flash">{{ message }}</p>{% endfor %}
+    {% endwith %}
+    <form method="post">
+        <button type="submit">Run Pipeline</button>
+    </form>
+    {% if current_task_id %}
+    <p>Task <code>{{ current_task_id }}</code>: <span id="status">{{ initial_task_status }}</span></p>
+    <div id="log"></div>
+    <script>
+        // Server pushes state transitions over SSE; no polling interval needed.
+        var source = new EventSource('/pipeline_stream/{{ current_task_id }}');
+        // Appending a text node per line is O(line); `textContent +=` would
+        // rebuild the whole accumulated log string on every event.
+        function appendLogLine(text) {
+            document.getElementById('log').appendChild(
+                document.createTextNode(text + '\\n'));
+        }
+        source.onmessage = function (event) {
+            if (event.data.indexOf('LOG: ') === 0) {
+                // Pipeline log lines stream into the log pane as they happen;
+                // only state transitions touch the status line.
+                appendLogLine(event.data.slice(5));
+                return;
+            }
+            document.getElementById('status').textContent = event.data;
+            appendLogLine(event.data);
+            if (event.data.indexOf('SUCCESS') === 0 || event.data.indexOf('FAILURE') === 0) {
+                source.close();
+            }
+        };
+    </script>
+    {% endif %}
+</body>
+</html>
+"""
+
+# Compile the template once at import; render_template_string would re-lex
+# and re-parse the whole string on every GET. Flask's jinja_env keeps
+# get_flashed_messages/url_for available as globals.
+_INDEX_TEMPLATE = app.jinja_env.from_string(html_template)
+
+@app.route('/', methods=['GET', 'POST'])
+def index():
+    if request.method == 'POST':
+        # Single-flight: the task id is generated up front so the lock can be
+        # taken before dispatch and released by the task (or here on a
+        # dispatch failure). A second POST while a run is live just attaches
+        # the browser to the run already in flight.
+        run_id = uuid.uuid4().hex
+        client = app.config['SESSION_REDIS']
+        if client.set(PIPELINE_LOCK_KEY, run_id, nx=True, ex=PIPELINE_LOCK_TTL):
+            try:
+                task = execute_podcast_pipeline.apply_async(task_id=run_id)
+                session['task_id'] = task.id
+                logger.info(f"Dispatched pipeline task {task.id}")
+            except Exception as e:
+                release_pipeline_lock(run_id)
+                logger.exception(f"Could not dispatch pipeline task: {e}")
+                flash(f"Could not start pipeline: {e}")
+        else:
+            owner = client.get(PIPELINE_LOCK_KEY)
+            if owner:
+                session['task_id'] = owner.decode()
+            flash("A pipeline run is already in progress; showing it below.")
+        return redirect(url_for('index'))
+
+    # The session stores only the task id; status is always stale by design
+    # (the SSE stream overwrites it immediately), so fetch it live once for
+    # the initial render instead of persisting it into the session store.
+    current_task_id = session.get('task_id')
+    initial_task_status = (
+        AsyncResult(current_task_id, app=celery_app).state if current_task_id else 'NONE'
+    )
+    return _INDEX_TEMPLATE.render(
+        current_task_id=current_task_id,
+        initial_task_status=initial_task_status,
+    )
+
+@app.route('/pipeline_status/<task_id>')
+def pipeline_status_route(task_id):
+    """
+    One-shot status endpoint; the SSE stream below is the live channel, this
+    remains for the initial page render and programmatic checks.
+    """
+    # One backend fetch: reading .state/.info/.result/.traceback off an
+    # AsyncResult issues a Redis GET per attribute, so pull the whole task
+    # meta dict in a single round-trip instead.
+    meta = celery_app.backend.get_task_meta(task_id)
+    state = meta.get('status')
+    result = meta.get('result')
+
+    response_data = {'task_id': task_id, 'state': state}
+    if state == 'SUCCESS':
+        response_data['result'] = result
+    elif state == 'FAILURE':
+        response_data['info'] = str(result)
+        response_data['traceback'] = meta.get('traceback')
+    else:
+        # PENDING/PROGRESS: 'result' carries the update_state meta dict.
+        response_data['info'] = result if isinstance(result, dict) else str(result)
+    return jsonify(response_data)
+
+@app.route('/pipeline_stream/<task_id>')
+def pipeline_stream_route(task_id):
+    """
+    Server-sent events stream of task state transitions. The Celery task
+    publishes each transition to the task_events:<task_id> Redis channel;
+    this generator relays them, eliminating the per-poll HTTP + Redis
+    round-trips of interval polling.
+    """
+    def generate():
+        # Subscribe BEFORE sampling the task state: a task that reaches its
+        # terminal state in between is then either caught by the state check
+        # below or its SUCCESS/FAILURE event is already queued on the
+        # subscription — checking first left a window where the event was
+        # published unheard and listen() blocked forever on a finished task.
+        client = redis.Redis.from_url(REDIS_URL)
+        pubsub = client.pubsub()
+        pubsub.subscribe(f"task_events:{task_id}")
+        try:
+            # Emit the current state first so late subscribers see something —
+            # and stop right there for already-finished tasks, otherwise this
+            # generator would block in pubsub.listen() on a channel that will
+            # never receive another message.
+            current_state = AsyncResult(task_id, app=celery_app).state
+            yield f"data: {current_state}\n\n"
+            if current_state in ('SUCCESS', 'FAILURE', 'REVOKED'):
+                return
+
+            for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                data = message['data']
+                if isinstance(data, bytes):
+                    data = data.decode('utf-8', errors='replace')
+                # Multi-line payloads (e.g. logged tracebacks) must become
+                # one "data:" line each, or the blank line inside the payload
+                # would terminate the SSE event early.
+                yield ''.join(f"data: {line}\n" for line in data.splitlines()) + '\n'
+                if data.startswith('SUCCESS') or data.startswith('FAILURE'):
+                    break
+        finally:
+            pubsub.close()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+if __name__ == '__main__':
+    # Debug mode (and its reloader, which double-imports every module) only
+    # when explicitly asked for; the default serves threaded so one slow
+    # request or SSE stream doesn't block the rest. Production runs under
+    # gunicorn per the README.
+    if os.environ.get('FLASK_DEBUG'):
+        app.run(debug=True, host='0.0.0.0', port=5001)
+    else:
+        app.run(debug=False, threaded=True, host='0.0.0.0', port=5001)
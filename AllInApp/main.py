@@ -1,91 +1,355 @@
+import functools
+import hashlib
 import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 import config # Import the configuration
 from rss_feed import fetch_latest_episode
-from audio_processing import process_audio
-from transcription import transcribe_audio
-from nlp_analysis import (
-    load_nlp_pipeline, 
-    extract_lessons, 
-    load_sentence_model, 
-    build_context
-)
-from show_art import load_diffusion_model, generate_show_art
 import json # For reading transcript
 
+# The processing modules (audio_processing, transcription, nlp_analysis,
+# show_art) are imported inside the steps that use them: their transitive
+# deps (pydub, spaCy, sentence-transformers, torch/diffusers) cost seconds
+# and hundreds of MB, and the common "no new episode" run — plus merely
+# importing this module from the task/GUI layer — should not pay for them.
+
 # Configure basic logging for the application
-# This should be the only place where basicConfig is called.
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler()] # Ensures logs go to console
-)
+# This should be the only place where basicConfig is called. The handler
+# guard makes the call a no-op when some other entry point (Celery's worker
+# setup, a WSGI server) already configured the root logger — registering a
+# second StreamHandler would emit every record twice.
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler()] # Ensures logs go to console
+    )
 logger = logging.getLogger(__name__) # Get a logger for this module (main)
 
-def run_pipeline():
+# Model loads dominate a warm pipeline run: the Stable Diffusion weights alone
+# take many GB of I/O, and spaCy/SentenceTransformer loads add tens of seconds.
+# Cache each loaded model once per process so repeated runs (e.g. consecutive
+# Celery task dispatches to the same worker child) pay the load cost once.
+# A failed load (None) is uncached at the call site via cache_clear() so the
+# next run retries instead of being stuck with a cached failure.
+
+@functools.lru_cache(maxsize=1)
+def get_nlp_pipeline():
+    from nlp_analysis import load_nlp_pipeline
+    return load_nlp_pipeline()
+
+@functools.lru_cache(maxsize=1)
+def get_sentence_model():
+    from nlp_analysis import load_sentence_model
+    return load_sentence_model()
+
+@functools.lru_cache(maxsize=1)
+def get_diffusion_model():
+    from show_art import load_diffusion_model
+    return load_diffusion_model() # Uses defaults
+
+# One GPU: diffusion inference must not overlap with itself.
+_DIFFUSION_LOCK = threading.Lock()
+
+def _sidecar_matches(output_path: str, sidecar_path: str, expected_key: str) -> bool:
     """
-    Main pipeline function to fetch, process, and transcribe a podcast episode.
+    True when the sidecar file records expected_key and output_path exists
+    non-empty — i.e. the expensive step that produced output_path can be
+    skipped because its input hasn't changed (a retry after a later-step
+    failure re-runs only the failed step, not the download/transcode).
     """
-    logger.info("===== Starting Podcast Processing Pipeline =====")
+    try:
+        with open(sidecar_path, 'r', encoding='utf-8') as f:
+            if f.read().strip() != expected_key:
+                return False
+        return os.path.getsize(output_path) > 0
+    except OSError:
+        return False
 
-    # Step 1: Fetch RSS Feed
-    logger.info("--- Step 1: Fetching RSS feed ---")
+def _wav_cache_key(wav_file_path: str) -> str:
+    """Content key for a WAV: sha256 of its first 1MB plus its size."""
+    with open(wav_file_path, 'rb') as f:
+        digest = hashlib.sha256(f.read(1 << 20)).hexdigest()
+    return f"{digest}:{os.path.getsize(wav_file_path)}"
+
+def _transcription_model_tag() -> str:
+    """Cache-key tag identifying the transcription backend and model."""
+    if getattr(config, 'TRANSCRIPTION_BACKEND', 'whisper_cpp') == 'faster_whisper':
+        return f"fw:{config.FASTER_WHISPER_MODEL}:{config.FASTER_WHISPER_COMPUTE_TYPE}"
+    return os.path.basename(config.preferred_whisper_model())
+
+def transcribe_episode_audio(wav_file_path: str, transcript_output_path: str):
+    """
+    Transcribes via the configured backend: the whisper.cpp subprocess by
+    default, or the resident faster-whisper model when
+    config.TRANSCRIPTION_BACKEND is 'faster_whisper'.
+
+    Returns:
+        The transcript path on success, None otherwise.
+    """
+    if getattr(config, 'TRANSCRIPTION_BACKEND', 'whisper_cpp') == 'faster_whisper':
+        from transcription_fw import transcribe_audio
+        return transcribe_audio(wav_file_path, transcript_output_path)
+    from transcription import transcribe_audio
+    return transcribe_audio(
+        wav_file_path, transcript_output_path,
+        config.WHISPER_EXECUTABLE_PATH, config.preferred_whisper_model(),
+    )
+
+def _transcribe_in_memory(audio_url, episode_title, progress_callback):
+    """
+    Steps 2 & 3 fast path for the faster-whisper backend: decodes the
+    episode straight to PCM samples in memory (process_audio_to_array) and
+    hands them to the resident model, skipping the WAV file round-trip.
+    Cached transcripts are keyed on episode URL + model tag, since no WAV
+    exists to fingerprint.
+
+    Returns:
+        The transcript path on success, or None to fall back to the WAV
+        pipeline.
+    """
+    logger.info(f"--- Steps 2 & 3: In-memory decode and transcription for '{episode_title}' ---")
+    _report_progress(progress_callback, f"Steps 2 & 3: Decoding and transcribing '{episode_title}' in memory")
+    transcript_sidecar = config.TRANSCRIPT_TXT + '.src'
+    cache_key = f"{audio_url}:{_transcription_model_tag()}"
     try:
-        audio_url, episode_title = fetch_latest_episode(config.RSS_FEED_URL, config.PROCESSED_JSON)
-        if not audio_url or not episode_title:
-            logger.info("No new episodes found or error in fetching. Pipeline run completed.")
-            return
-        logger.info(f"Successfully fetched new episode: '{episode_title}' from {audio_url}")
+        if _sidecar_matches(config.TRANSCRIPT_TXT, transcript_sidecar, cache_key):
+            logger.info(f"Reusing cached transcript for this episode: {config.TRANSCRIPT_TXT}")
+            return config.TRANSCRIPT_TXT
+
+        from audio_processing import process_audio_to_array
+        samples = process_audio_to_array(audio_url)
+        if samples is None:
+            logger.warning("In-memory decode failed; falling back to the WAV pipeline.")
+            return None
+
+        from transcription_fw import transcribe_audio
+        transcript_path = transcribe_audio(None, config.TRANSCRIPT_TXT, samples=samples)
+        if not transcript_path:
+            logger.warning("In-memory transcription failed; falling back to the WAV pipeline.")
+            return None
+        config.atomic_write_text(transcript_sidecar, cache_key)
+        logger.info(f"Successfully transcribed audio in memory. Transcript saved to: {transcript_path}")
+        return transcript_path
     except Exception as e:
-        logger.exception(f"Critical error during RSS feed fetching. Exiting pipeline. Error: {e}")
-        return
+        logger.exception(f"In-memory decode/transcribe failed for '{episode_title}': {e}. Falling back to the WAV pipeline.")
+        return None
 
+def _transcribe_via_wav(audio_url, episode_title, progress_callback):
+    """
+    Steps 2 & 3: downloads/converts the episode to the cached WAV, then
+    transcribes it via the configured backend. Factored out of run_pipeline
+    so the in-memory fast path above can bypass it.
+
+    Returns:
+        The transcript path on success, None when the pipeline should stop
+        (failures are logged here, as before).
+    """
     # Step 2: Process Audio
     logger.info(f"--- Step 2: Processing audio for '{episode_title}' ---")
+    _report_progress(progress_callback, f"Step 2: Processing audio for '{episode_title}'")
+    # A .url sidecar records which episode the cached WAV came from, so a
+    # retry after a downstream failure skips the download + transcode.
+    wav_url_sidecar = config.LATEST_AUDIO_WAV + '.url'
     try:
-        wav_file_path = process_audio(audio_url, config.LATEST_AUDIO_WAV) 
-        if not wav_file_path:
-            logger.error(f"Audio processing failed for '{episode_title}'. See previous logs for details. Exiting pipeline for this episode.")
-            return
-        logger.info(f"Successfully processed audio. WAV file saved to: {wav_file_path}")
+        if _sidecar_matches(config.LATEST_AUDIO_WAV, wav_url_sidecar, audio_url):
+            wav_file_path = config.LATEST_AUDIO_WAV
+            logger.info(f"Reusing cached WAV for this episode: {wav_file_path}")
+        else:
+            from audio_processing import process_audio
+            wav_file_path = process_audio(audio_url, config.LATEST_AUDIO_WAV)
+            if not wav_file_path:
+                logger.error(f"Audio processing failed for '{episode_title}'. See previous logs for details. Exiting pipeline for this episode.")
+                return None
+            config.atomic_write_text(wav_url_sidecar, audio_url)
+            logger.info(f"Successfully processed audio. WAV file saved to: {wav_file_path}")
     except Exception as e:
         logger.exception(f"Critical error during audio processing for '{episode_title}'. Exiting pipeline. Error: {e}")
-        return
+        return None
 
     # Step 3: Transcribe Audio
     logger.info(f"--- Step 3: Transcribing audio for '{episode_title}' ---")
-    # Ensure WHISPER_EXECUTABLE_PATH and WHISPER_MODEL_PATH are correctly set in config.py
-    if not hasattr(config, 'WHISPER_EXECUTABLE_PATH') or not config.WHISPER_EXECUTABLE_PATH or \
-       not hasattr(config, 'WHISPER_MODEL_PATH') or not config.WHISPER_MODEL_PATH:
+    _report_progress(progress_callback, f"Step 3: Transcribing audio for '{episode_title}'")
+    # Ensure WHISPER_EXECUTABLE_PATH and WHISPER_MODEL_PATH are correctly set
+    # in config.py (the faster-whisper backend needs neither).
+    if getattr(config, 'TRANSCRIPTION_BACKEND', 'whisper_cpp') != 'faster_whisper' and (
+            not getattr(config, 'WHISPER_EXECUTABLE_PATH', None) or
+            not getattr(config, 'WHISPER_MODEL_PATH', None)):
         logger.error("WHISPER_EXECUTABLE_PATH or WHISPER_MODEL_PATH is not defined or empty in config.py.")
         logger.error("Please define them. Example: WHISPER_EXECUTABLE_PATH = os.path.join(BASE_DIR, 'whisper.cpp', 'main')")
         logger.error("Pipeline cannot continue without Whisper paths.")
+        return None
+
+    # Same skip for the transcript, keyed on the WAV's content rather than
+    # the URL so a re-downloaded identical file still hits the cache.
+    transcript_sidecar = config.TRANSCRIPT_TXT + '.src'
+    try:
+        # The backend/model is part of the key: swapping in e.g. a quantized
+        # model must invalidate transcripts produced by the old one.
+        wav_key = f"{_wav_cache_key(wav_file_path)}:{_transcription_model_tag()}"
+        if _sidecar_matches(config.TRANSCRIPT_TXT, transcript_sidecar, wav_key):
+            transcript_path = config.TRANSCRIPT_TXT
+            logger.info(f"Reusing cached transcript for this audio: {transcript_path}")
+        else:
+            transcript_path = transcribe_episode_audio(wav_file_path, config.TRANSCRIPT_TXT)
+            if not transcript_path:
+                logger.error(f"Audio transcription failed for '{episode_title}'. See previous logs for details. Exiting pipeline for this episode.")
+                return None
+            config.atomic_write_text(transcript_sidecar, wav_key)
+            logger.info(f"Successfully transcribed audio. Transcript saved to: {transcript_path}")
+    except Exception as e:
+        logger.exception(f"Critical error during audio transcription for '{episode_title}'. Exiting pipeline. Error: {e}")
+        return None
+    return transcript_path
+
+def render_show_art_cached(prompt: str, output_path: str):
+    """
+    Renders show art for prompt into output_path, keyed by a prompt hash:
+    re-runs with an unchanged title (e.g. a retry after a later failure)
+    copy the cached art_<key>.jpg instead of paying a diffusion pass — and
+    the cache check runs before the model load, so a hit costs no GPU at
+    all. Used by both the in-process Step 5 and the gpu-queue art task.
+
+    Returns:
+        output_path on success, None on failure.
+    """
+    key = hashlib.blake2b(prompt.encode(), digest_size=8).hexdigest()
+    cache_path = os.path.join(os.path.dirname(output_path) or '.', f'art_{key}.jpg')
+    try:
+        if os.path.getsize(cache_path) > 0:
+            if cache_path != output_path:
+                shutil.copyfile(cache_path, output_path)
+            logger.info(f"Reusing cached show art {cache_path} for this prompt.")
+            return output_path
+    except OSError:
+        pass
+
+    logger.info("Loading Stable Diffusion model for show art generation...")
+    diffusion_model = get_diffusion_model()
+    if not diffusion_model:
+        get_diffusion_model.cache_clear()
+        logger.error("Failed to load Stable Diffusion model. Skipping show art generation for this episode.")
+        return None
+
+    logger.info("Generating show art...")
+    from show_art import generate_show_art
+    with _DIFFUSION_LOCK:
+        generated_path = generate_show_art(prompt, cache_path, diffusion_model)
+    if not generated_path:
+        return None
+    if cache_path != output_path:
+        shutil.copyfile(cache_path, output_path)
+    return output_path
+
+def _report_progress(progress_callback, step_description: str):
+    """
+    Invokes the optional progress callback supplied by a task wrapper (e.g.
+    Celery's update_state). Reporting failures must never break the pipeline,
+    so exceptions are logged and swallowed.
+    """
+    if progress_callback is None:
         return
-    
     try:
-        transcript_path = transcribe_audio(
-            wav_file_path,
-            config.TRANSCRIPT_TXT, 
-            config.WHISPER_EXECUTABLE_PATH,
-            config.WHISPER_MODEL_PATH
-        )
-        if not transcript_path:
-            logger.error(f"Audio transcription failed for '{episode_title}'. See previous logs for details. Exiting pipeline for this episode.")
+        progress_callback(step_description)
+    except Exception as e:
+        logger.warning(f"Progress callback failed for '{step_description}': {e}")
+
+def run_pipeline(progress_callback=None):
+    """
+    Main pipeline function to fetch, process, and transcribe a podcast episode.
+
+    Args:
+        progress_callback: Optional callable invoked with a step description
+            at the start of each step, used by the Celery task wrapper to
+            surface PROGRESS states to the GUI.
+    """
+    logger.info("===== Starting Podcast Processing Pipeline =====")
+
+    # Make sure the data/models directories exist before any step writes to them.
+    config.ensure_dirs()
+
+    # Step 1: Fetch RSS Feed
+    logger.info("--- Step 1: Fetching RSS feed ---")
+    _report_progress(progress_callback, "Step 1: Fetching RSS feed")
+    try:
+        audio_url, episode_title = fetch_latest_episode(config.RSS_FEED_URL, config.PROCESSED_JSON)
+        if not audio_url or not episode_title:
+            logger.info("No new episodes found or error in fetching. Pipeline run completed.")
             return
-        logger.info(f"Successfully transcribed audio. Transcript saved to: {transcript_path}")
+        logger.info(f"Successfully fetched new episode: '{episode_title}' from {audio_url}")
     except Exception as e:
-        logger.exception(f"Critical error during audio transcription for '{episode_title}'. Exiting pipeline. Error: {e}")
+        logger.exception(f"Critical error during RSS feed fetching. Exiting pipeline. Error: {e}")
         return
 
-    # Step 4: NLP Analysis
+    # There is an episode to process, so the model loads are no longer
+    # speculative: warm the caches now, overlapped with the download and
+    # transcription below, instead of paying them serially at steps 4/5.
+    # (Deliberately after step 1 so the no-new-episode run stays light.)
+    # If a later step fails early, the loads still run to completion in the
+    # background — the warm cache serves the retry, at the cost of a one-shot
+    # CLI run not exiting until they finish.
+    preload_pool = ThreadPoolExecutor(max_workers=3)
+    preload_futures = [
+        preload_pool.submit(loader)
+        for loader in (get_nlp_pipeline, get_sentence_model, get_diffusion_model)
+    ]
+    preload_pool.shutdown(wait=False)
+
+    # Steps 2 & 3: audio to transcript. The faster-whisper backend accepts
+    # raw PCM, so it gets a fast path that decodes the download straight to
+    # samples in memory and skips the WAV file round-trip; any failure there
+    # falls back to the WAV pipeline, which is also the only path for the
+    # whisper.cpp subprocess (it needs a file on disk).
+    transcript_path = None
+    if getattr(config, 'TRANSCRIPTION_BACKEND', 'whisper_cpp') == 'faster_whisper':
+        transcript_path = _transcribe_in_memory(audio_url, episode_title, progress_callback)
+    if transcript_path is None:
+        transcript_path = _transcribe_via_wav(audio_url, episode_title, progress_callback)
+        if not transcript_path:
+            return
+
+    # Steps 4 & 5: NLP Analysis and Show Art, concurrently.
+    # The two steps are independent — NLP consumes the transcript, show art
+    # only the episode title — and stress different resources (CPU vs GPU),
+    # so wall time collapses to max(t_nlp, t_art) instead of their sum.
+    logger.info(f"--- Steps 4 & 5: NLP analysis and show art for '{episode_title}' (concurrent) ---")
+    _report_progress(progress_callback, f"Steps 4 & 5: NLP analysis and show art for '{episode_title}'")
+    # Let in-flight warm-up loads settle first: lru_cache doesn't lock during
+    # a miss, so calling a getter while its preload is still running would
+    # load the same model twice.
+    wait(preload_futures)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        nlp_future = executor.submit(_run_nlp_analysis, transcript_path, episode_title)
+        art_future = executor.submit(_run_show_art, episode_title)
+        for future, step_name in ((nlp_future, 'NLP analysis'), (art_future, 'show art generation')):
+            try:
+                future.result()
+            except Exception as e:
+                logger.exception(f"Critical error during {step_name} for '{episode_title}': {e}")
+
+
+def _run_nlp_analysis(transcript_path, episode_title):
+    """
+    Step 4: reads the transcript and runs lesson/keyword extraction plus
+    context building. Factored out of run_pipeline so it can run concurrently
+    with show art generation; early exits log their reason as before.
+    """
     logger.info(f"--- Step 4: Starting NLP Analysis for '{episode_title}' ---")
+    from nlp_analysis import build_context, extract_lessons
 
     # a. Read Transcript Text
     transcript_text = ""
     logger.info(f"Reading transcript from: {transcript_path}")
     try:
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
-        if not transcript_text.strip():
+        # A zero-byte transcript is settled by one stat, before reading.
+        if os.path.getsize(transcript_path) > 0:
+            with open(transcript_path, 'r', encoding='utf-8') as f:
+                transcript_text = f.read()
+        # isspace() scans in place; strip() would build a second full-size
+        # copy of the transcript just to test emptiness.
+        if not transcript_text or transcript_text.isspace():
             logger.warning(f"Transcript file {transcript_path} is empty or contains only whitespace. Skipping NLP analysis.")
             # Log completion without NLP
             logger.info(f"===== Partially Processed Episode (empty transcript): '{episode_title}' =====")
@@ -95,16 +359,35 @@ def run_pipeline():
         logger.exception(f"Failed to read transcript file {transcript_path}. Cannot proceed with NLP analysis.")
         return
 
+    # A retry with a byte-identical transcript has nothing new to analyze —
+    # and re-running would add duplicate lesson vectors to the FAISS store.
+    # The .nlp sidecar records the hash of the last successfully analyzed
+    # transcript; written only after the full step completes below.
+    transcript_hash = hashlib.sha256(transcript_text.encode('utf-8')).hexdigest()
+    nlp_sidecar = transcript_path + '.nlp'
+    try:
+        with open(nlp_sidecar, 'r', encoding='utf-8') as f:
+            if f.read().strip() == transcript_hash:
+                logger.info(f"NLP analysis already completed for this transcript ({transcript_path}); skipping Step 4.")
+                return
+    except OSError:
+        pass
+
     # b. Load NLP Pipeline (spaCy + pytextrank)
     logger.info("Loading NLP pipeline (spaCy, pytextrank)...")
-    nlp = load_nlp_pipeline()
+    nlp = get_nlp_pipeline()
     if not nlp:
+        get_nlp_pipeline.cache_clear()
         logger.error("Failed to load NLP pipeline. Cannot proceed with NLP analysis.")
         return
 
     # c. Extract Lessons and Keywords
     logger.info("Extracting lessons and keywords...")
     lessons, keywords = extract_lessons(transcript_text, nlp)
+    # The remaining sub-steps work on the extracted lessons, not the raw
+    # text; drop the transcript now so a long-form episode isn't held in
+    # memory while the sentence model embeds and searches.
+    del transcript_text
     if not lessons:
         logger.warning("No lessons extracted from transcript. NLP analysis might yield limited results.")
         # Still proceed, as keywords might be present or context building might be useful even with few lessons.
@@ -118,14 +401,15 @@ def run_pipeline():
     
     # d. Load Sentence Model
     logger.info("Loading sentence model...")
-    sentence_model = load_sentence_model()
+    sentence_model = get_sentence_model()
     if not sentence_model:
+        get_sentence_model.cache_clear()
         logger.error("Failed to load sentence model. Cannot proceed with context building.")
         return
 
     # e. Build Context
     # Ensure FAISS_INDEX_PATH and PAST_LESSONS_PATH are defined in config
-    if not hasattr(config, 'FAISS_INDEX_PATH') or not hasattr(config, 'PAST_LESSONS_PATH'):
+    if getattr(config, 'FAISS_INDEX_PATH', None) is None or getattr(config, 'PAST_LESSONS_PATH', None) is None:
         logger.error("FAISS_INDEX_PATH or PAST_LESSONS_PATH not defined in config.py. Cannot build context.")
         # Log completion without context building
         logger.info(f"===== Partially Processed Episode (missing FAISS/PastLessons config): '{episode_title}' =====")
@@ -143,38 +427,34 @@ def run_pipeline():
     logger.info(f"Final transcript available at: {transcript_path}")
     logger.info(f"Lessons extracted: {len(lessons)}, Keywords extracted: {len(keywords)}")
     logger.info(f"Related context items found: {len(related_context)}")
+    config.atomic_write_text(nlp_sidecar, transcript_hash)
 
-    # Step 5: Generate Show Art
+
+def _run_show_art(episode_title):
+    """
+    Step 5: renders the episode's show art via the prompt-keyed cache.
+    Runs concurrently with NLP analysis; _DIFFUSION_LOCK serializes access
+    to the single GPU should multiple callers ever share this process.
+    """
     logger.info(f"--- Step 5: Generating Show Art for '{episode_title}' ---")
-    diffusion_model = None # Initialize to None
     if not hasattr(config, 'SHOW_ART_JPG'):
         logger.warning("config.SHOW_ART_JPG not defined. Skipping show art generation.")
+        return
+    if not episode_title:
+        logger.warning("Episode title not available. Skipping show art generation as prompt cannot be formed.")
+        logger.info(f"===== Episode Processed (NLP complete, Show Art skipped - no title): '{episode_title}' =====")
+        return
+
+    prompt = f"Podcast show art for an episode titled: '{episode_title}'. Style: vibrant, abstract, tech-themed, digital art."
+    logger.info(f"Using prompt for show art: {prompt}")
+
+    show_art_path = render_show_art_cached(prompt, config.SHOW_ART_JPG)
+    if show_art_path:
+        logger.info(f"Show art generated and saved to: {show_art_path}")
+        logger.info(f"===== Episode Fully Processed (including Show Art): '{episode_title}' =====")
     else:
-        # a. Load Diffusion Model
-        logger.info("Loading Stable Diffusion model for show art generation...")
-        diffusion_model = load_diffusion_model() # Uses defaults
-        if not diffusion_model:
-            logger.error("Failed to load Stable Diffusion model. Skipping show art generation for this episode.")
-        
-        # b. Construct Prompt & c. Generate Show Art (if model loaded)
-        if diffusion_model:
-            if episode_title:
-                prompt = f"Podcast show art for an episode titled: '{episode_title}'. Style: vibrant, abstract, tech-themed, digital art."
-                logger.info(f"Using prompt for show art: {prompt}")
-                
-                logger.info("Generating show art...")
-                show_art_path = generate_show_art(prompt, config.SHOW_ART_JPG, diffusion_model)
-                if show_art_path:
-                    logger.info(f"Show art generated and saved to: {show_art_path}")
-                    logger.info(f"===== Episode Fully Processed (including Show Art): '{episode_title}' =====")
-                else:
-                    logger.error("Failed to generate show art.")
-                    logger.info(f"===== Episode Processed (NLP complete, Show Art failed): '{episode_title}' =====")
-            else:
-                logger.warning("Episode title not available. Skipping show art generation as prompt cannot be formed.")
-                logger.info(f"===== Episode Processed (NLP complete, Show Art skipped - no title): '{episode_title}' =====")
-        else: # diffusion_model was not loaded
-             logger.info(f"===== Episode Processed (NLP complete, Show Art skipped - model load fail): '{episode_title}' =====")
+        logger.error("Failed to generate show art.")
+        logger.info(f"===== Episode Processed (NLP complete, Show Art failed): '{episode_title}' =====")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
-import spacy
-import pytextrank # Though not directly called, it's good for clarity and registers the pipe
 import logging
-from sentence_transformers import SentenceTransformer
-import faiss # To be used for indexing in later steps
-import numpy
 import json
 import os
 
+try:
+    import orjson # C-accelerated; several times faster on the growing lesson store
+except ImportError:
+    orjson = None
+
+# spaCy/pytextrank, sentence_transformers, and faiss are imported inside the
+# loaders that need them: together they cost seconds and hundreds of MB at
+# import, and worker/GUI code imports this module without touching NLP.
+
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
@@ -26,9 +30,17 @@ def load_nlp_pipeline():
         return NLP_PIPELINE
 
     try:
-        # Load the spaCy model
-        nlp = spacy.load("en_core_web_sm")
-        logger.info("Successfully loaded spaCy model 'en_core_web_sm'.")
+        import spacy
+        import pytextrank # Not called directly, but importing registers the textrank pipe
+        # Use the GPU when thinc has a cupy backend available; harmless
+        # no-op (returns False) otherwise.
+        if spacy.prefer_gpu():
+            logger.info("spaCy running with GPU acceleration.")
+        # NER is the one component nothing downstream reads — textrank needs
+        # the tagger/parser for noun chunks and the keyword pass reads
+        # token.lemma_, so those stay. Disabling NER trims per-doc time.
+        nlp = spacy.load("en_core_web_sm", disable=["ner"])
+        logger.info("Successfully loaded spaCy model 'en_core_web_sm' (ner disabled).")
 
         # Add pytextrank to the pipeline
         # Check if "textrank" is already in the pipe to avoid adding it multiple times if this func is called again
@@ -50,29 +62,66 @@ def load_nlp_pipeline():
         logger.exception(f"An unexpected error occurred while loading the NLP pipeline: {e}")
         return None
 
-def extract_lessons(transcript_text: str, nlp_pipeline) -> tuple[list[str], list[str]]:
+def extract_lessons(transcript_text: str, nlp_pipeline, doc=None) -> tuple[list[str], list[str]]:
     """
     Extracts key phrases (lessons) and relevant keywords from a transcript using pytextrank.
 
     Args:
         transcript_text: The input text of the podcast transcript.
         nlp_pipeline: The loaded spaCy pipeline with pytextrank.
+        doc: Optional precomputed spaCy Doc for transcript_text; callers that
+            already parsed the transcript pass it to skip a second parse.
 
     Returns:
-        A tuple containing two lists: 
+        A tuple containing two lists:
         1.  list_of_lesson_strings: Top N key phrases (lessons).
         2.  list_of_keyword_strings: Unique keywords derived from these lessons.
     """
     if not nlp_pipeline:
         logger.error("NLP pipeline is not loaded. Cannot extract lessons.")
         return [], []
-    if not transcript_text:
-        logger.warning("Transcript text is empty. Returning empty lessons and keywords.")
-        return [], []
+    if doc is None:
+        if not transcript_text:
+            logger.warning("Transcript text is empty. Returning empty lessons and keywords.")
+            return [], []
+        logger.info("Processing transcript to extract lessons and keywords...")
+        doc = nlp_pipeline(transcript_text)
+
+    return _lessons_from_doc(doc)
 
-    logger.info("Processing transcript to extract lessons and keywords...")
-    doc = nlp_pipeline(transcript_text)
+def extract_lessons_batch(transcripts: list[str], nlp_pipeline, batch_size: int = 8, parallel: bool = False) -> list[tuple[list[str], list[str]]]:
+    """
+    Batch form of extract_lessons for reprocessing many transcripts at once:
+    nlp.pipe amortizes spaCy's per-call overhead across documents instead of
+    paying it per transcript. With parallel=True the documents are sharded
+    across half the CPUs via n_process — near-linear for historical
+    reindexing runs — falling back to a single process if the pipeline
+    (e.g. a non-picklable component) can't fork.
 
+    Returns:
+        One (lessons, keywords) tuple per input transcript, in order.
+    """
+    if not nlp_pipeline:
+        logger.error("NLP pipeline is not loaded. Cannot extract lessons.")
+        return [([], []) for _ in transcripts]
+    if parallel:
+        n_process = max(1, (os.cpu_count() or 2) // 2)
+        if n_process > 1:
+            try:
+                logger.info(f"extract_lessons_batch: multiprocess mode ({n_process} workers).")
+                return [
+                    _lessons_from_doc(doc)
+                    for doc in nlp_pipeline.pipe(transcripts, batch_size=batch_size, n_process=n_process)
+                ]
+            except Exception as e:
+                logger.warning(f"Multiprocess nlp.pipe failed ({e}); falling back to single process.")
+    return [
+        _lessons_from_doc(doc)
+        for doc in nlp_pipeline.pipe(transcripts, batch_size=batch_size)
+    ]
+
+def _lessons_from_doc(doc) -> tuple[list[str], list[str]]:
+    """Phrase/keyword extraction shared by the single and batch entry points."""
     if not doc._.phrases:
         logger.warning("No phrases extracted by pytextrank. Returning empty lessons and keywords.")
         return [], []
@@ -81,38 +130,50 @@ def extract_lessons(transcript_text: str, nlp_pipeline) -> tuple[list[str], list
     # Sort phrases by rank in descending order and take top N (e.g., 15)
     sorted_phrases = sorted(doc._.phrases, key=lambda p: p.rank, reverse=True)
     top_n_lessons = 15
-    extracted_lessons_text = [phrase.text for phrase in sorted_phrases[:top_n_lessons]]
+    top_phrases = sorted_phrases[:top_n_lessons]
+    extracted_lessons_text = [phrase.text for phrase in top_phrases]
     logger.info(f"Extracted {len(extracted_lessons_text)} lessons (top {top_n_lessons} phrases).")
 
     # Extract Keywords from these top lessons
-    keywords = set()
     max_keywords = 30 # Target maximum number of unique keywords
 
-    for phrase_text in extracted_lessons_text:
-        # Re-process the lesson text with the same pipeline to get tokens if not directly available
-        # or iterate through phrase.chunks if TextRankPhrase gives direct access to its constituent tokens
-        # (doc._.phrases are TextRankPhrase objects, each has .chunks which are spaCy Spans)
-        
-        # Find the original phrase object to access its chunks
-        # This is a bit inefficient; if performance is critical, optimize
-        original_phrase_obj = next((p for p in doc._.phrases if p.text == phrase_text), None)
-        if not original_phrase_obj:
-            continue
-
-        for chunk in original_phrase_obj.chunks: # chunk is a spaCy Span
-            for token in chunk:
-                if not token.is_stop and not token.is_punct and token.lemma_:
-                    keywords.add(token.lemma_.lower())
-        
-        if len(keywords) >= max_keywords: # Stop if we have enough keywords
-            break 
-            
-    # Ensure we don't exceed max_keywords if the loop finished before break
-    final_keywords = list(keywords)[:max_keywords] 
+    # doc._.phrases are TextRankPhrase objects; each carries its .chunks
+    # (spaCy Spans), so the tokens are at hand — no per-lesson rescan of
+    # the phrase list, and no re-parse of the lesson text.
+    token_lemmas = (
+        token.lemma_.lower()
+        for phrase in top_phrases
+        for chunk in phrase.chunks # chunk is a spaCy Span
+        for token in chunk
+        if not token.is_stop and not token.is_punct and token.lemma_
+    )
+    # Insertion-ordered dict as an ordered set: keywords from higher-ranked
+    # phrases come first, and the cap cuts off per token instead of
+    # overshooting by a whole phrase and slicing an unordered set after.
+    keywords: dict[str, None] = {}
+    for lemma in token_lemmas:
+        keywords.setdefault(lemma)
+        if len(keywords) >= max_keywords:
+            break
+
+    final_keywords = list(keywords)
     logger.info(f"Extracted {len(final_keywords)} unique keywords from lessons.")
 
     return extracted_lessons_text, final_keywords
 
+def _detect_device() -> str:
+    """Best available torch device: cuda, then Apple mps, else cpu."""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            return "cuda"
+        mps = getattr(torch.backends, 'mps', None)
+        if mps is not None and mps.is_available():
+            return "mps"
+    except Exception:
+        pass
+    return "cpu"
+
 def load_sentence_model():
     """
     Loads the SentenceTransformer model.
@@ -127,8 +188,21 @@ def load_sentence_model():
 
     model_name = 'all-MiniLM-L6-v2'
     try:
-        logger.info(f"Loading SentenceTransformer model: {model_name}...")
-        SENTENCE_MODEL = SentenceTransformer(model_name)
+        from sentence_transformers import SentenceTransformer
+        device = _detect_device()
+        logger.info(f"Loading SentenceTransformer model: {model_name} (device={device})...")
+        SENTENCE_MODEL = SentenceTransformer(model_name, device=device)
+        # Everything encoded here is a short lesson phrase; capping the
+        # sequence length bounds padding cost well below the 512 default.
+        SENTENCE_MODEL.max_seq_length = 128
+        import torch
+        if torch.cuda.is_available():
+            # fp16 halves memory bandwidth and doubles matmul throughput on
+            # the encoder; MiniLM embeddings are robust to the precision
+            # loss. TF32 matmuls for whatever stays fp32.
+            SENTENCE_MODEL = SENTENCE_MODEL.half()
+            torch.set_float32_matmul_precision("high")
+            logger.info("SentenceTransformer running in fp16 on CUDA.")
         logger.info(f"SentenceTransformer model '{model_name}' loaded successfully.")
         return SENTENCE_MODEL
     except Exception as e:
@@ -136,6 +210,48 @@ def load_sentence_model():
         # This could be due to network issues if downloading, or other Hugging Face Hub/cache problems.
         return None
 
+# IVF+PQ upgrade parameters for the past-lessons index. Brute-force
+# IndexFlatL2 is exact and plenty fast while the store is small, so it stays
+# the bootstrap index; once enough vectors accumulate to train k-means, the
+# store is migrated to IVF256,PQ48x8 — coarse quantization cuts the scanned
+# fraction per query and PQ shrinks each 1536-byte vector to 48 bytes.
+_IVF_NLIST = 256
+_IVF_TRAIN_THRESHOLD = 10 * _IVF_NLIST
+_IVF_NPROBE = 8
+
+# Eviction cap for the past-lessons store: beyond this, the oldest tenth is
+# dropped in one sweep so search latency and RSS stay flat. Most context
+# value comes from recent lessons anyway.
+_MAX_PAST_LESSONS = 20000
+
+def _maybe_upgrade_index(index, embedding_dimension: int):
+    """
+    Migrates the bootstrap IndexFlatL2 to IVF+PQ once it holds enough
+    vectors to train on. Returns the index to use (possibly the original).
+    """
+    if hasattr(index, 'nprobe'): # already IVF
+        return index
+    if index.ntotal < _IVF_TRAIN_THRESHOLD:
+        return index
+    if embedding_dimension % 48 != 0:
+        # PQ48 needs the dimension split into 48 even sub-vectors.
+        return index
+    try:
+        import faiss
+        vectors = index.reconstruct_n(0, index.ntotal)
+        upgraded = faiss.index_factory(embedding_dimension, f"IVF{_IVF_NLIST},PQ48x8", faiss.METRIC_INNER_PRODUCT)
+        upgraded.train(vectors)
+        upgraded.add(vectors)
+        upgraded.nprobe = _IVF_NPROBE
+        logger.info(
+            f"Upgraded past-lessons index to IVF{_IVF_NLIST},PQ48x8 "
+            f"({index.ntotal} vectors migrated)."
+        )
+        return upgraded
+    except Exception as e:
+        logger.exception(f"IVF+PQ index upgrade failed; keeping flat index. Error: {e}")
+        return index
+
 def build_context(current_lessons_text: list[str], sentence_model, faiss_index_path: str, past_lessons_json_path: str, top_k_similar: int = 3) -> list[str]:
     """
     Builds context by finding past lessons related to current lessons using FAISS.
@@ -155,6 +271,7 @@ def build_context(current_lessons_text: list[str], sentence_model, faiss_index_p
         logger.error("Sentence model is not loaded. Cannot build context.")
         return []
 
+    import faiss
     embedding_dimension = sentence_model.get_sentence_embedding_dimension()
     index = None
     past_lessons_data = []
@@ -163,63 +280,107 @@ def build_context(current_lessons_text: list[str], sentence_model, faiss_index_p
         if os.path.exists(faiss_index_path) and os.path.exists(past_lessons_json_path):
             logger.info(f"Loading existing FAISS index from {faiss_index_path} and lessons from {past_lessons_json_path}")
             index = faiss.read_index(faiss_index_path)
-            with open(past_lessons_json_path, 'r') as f:
-                past_lessons_data = json.load(f)
+            if hasattr(index, 'nprobe'):
+                index.nprobe = _IVF_NPROBE
+            with open(past_lessons_json_path, 'rb') as f:
+                raw = f.read()
+            past_lessons_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             # Sanity check for dimension mismatch
             if index.d != embedding_dimension:
                 logger.warning(f"FAISS index dimension ({index.d}) mismatch with model dimension ({embedding_dimension}). Re-initializing index.")
-                index = faiss.IndexFlatL2(embedding_dimension)
+                index = faiss.IndexFlatIP(embedding_dimension)
                 past_lessons_data = [] # Data associated with old index is no longer valid
+            elif index.metric_type != faiss.METRIC_INNER_PRODUCT:
+                # Indexes persisted before the cosine switch hold raw-L2
+                # vectors; distances would be incomparable. Rebuild.
+                logger.warning("FAISS index uses the old L2 metric. Re-initializing with inner product.")
+                index = faiss.IndexFlatIP(embedding_dimension)
+                past_lessons_data = []
         else:
             logger.info("No existing FAISS index or lessons file found. Creating new ones.")
-            index = faiss.IndexFlatL2(embedding_dimension)
+            index = faiss.IndexFlatIP(embedding_dimension)
             past_lessons_data = []
     except Exception as e:
         logger.exception(f"Error loading FAISS index or past lessons. Re-initializing. Error: {e}")
-        index = faiss.IndexFlatL2(embedding_dimension) # Fallback to new index
+        index = faiss.IndexFlatIP(embedding_dimension) # Fallback to new index
         past_lessons_data = []
 
 
     related_context_lessons_set = set() # Use a set to ensure uniqueness initially
 
-    if current_lessons_text and index.ntotal > 0:
+    # Encode all current lessons in one batched call and reuse the matrix for
+    # both the similarity search and the index update below — the lessons
+    # were previously embedded twice. One batch means one matmul dispatch per
+    # transformer layer instead of per lesson.
+    current_lesson_embeddings = None
+    if current_lessons_text:
+        try:
+            # Routed through the persistent per-lesson memo: recurring
+            # lessons (backlog reprocessing, retries) skip the forward pass.
+            from embedding_cache import get_or_compute
+            current_lesson_embeddings = get_or_compute(current_lessons_text, sentence_model)
+            # The cache stores raw vectors; normalize the (freshly stacked)
+            # batch in place so inner product equals cosine similarity.
+            faiss.normalize_L2(current_lesson_embeddings)
+        except Exception as e:
+            logger.exception(f"Error encoding current lessons: {e}")
+
+    if current_lesson_embeddings is not None and index.ntotal > 0:
         logger.info(f"Finding related context for {len(current_lessons_text)} new lessons from {index.ntotal} past lessons.")
+        # Hoisted set: the membership test below runs once per FAISS hit.
+        current_lessons_set = set(current_lessons_text)
         try:
-            # Encode all current lessons once
-            current_lesson_embeddings = sentence_model.encode(current_lessons_text)
-            
             # Search for similar past lessons for each current lesson
             # FAISS search works on a batch of vectors
             # D: distances, I: indices
-            D, I = index.search(numpy.array(current_lesson_embeddings).astype(numpy.float32), k=top_k_similar)
-
-            for i in range(len(current_lessons_text)): # For each current lesson's search result
-                for j, idx in enumerate(I[i]): # For each similar item found for current_lessons_text[i]
-                    if idx != -1: # FAISS returns -1 if fewer than k items exist or for padding
-                        # Ensure the found index is valid for past_lessons_data
-                        if 0 <= idx < len(past_lessons_data):
-                             # Check if the found lesson is not one of the current_lessons_text (if they were already added in a previous run)
-                            if past_lessons_data[idx] not in current_lessons_text:
-                                related_context_lessons_set.add(past_lessons_data[idx])
-                        else:
-                            logger.warning(f"FAISS returned index {idx} which is out of bounds for past_lessons_data (size {len(past_lessons_data)}). Skipping.")
-            
+            D, I = index.search(current_lesson_embeddings, k=top_k_similar)
+
+            # Filter the hit matrix with boolean masks instead of nested
+            # Python loops: -1 marks FAISS padding, and anything beyond the
+            # lesson store is stale index state worth one warning, not a
+            # branch per hit.
+            valid = (I != -1) & (I < len(past_lessons_data))
+            out_of_bounds = int(((I != -1) & ~valid).sum())
+            if out_of_bounds:
+                logger.warning(f"FAISS returned {out_of_bounds} indices out of bounds for past_lessons_data (size {len(past_lessons_data)}). Skipping them.")
+            related_context_lessons_set.update(
+                lesson for lesson in (past_lessons_data[idx] for idx in I[valid].tolist())
+                # Skip lessons that are among the current ones (already added in a previous run)
+                if lesson not in current_lessons_set
+            )
+
             logger.info(f"Found {len(related_context_lessons_set)} unique related past lessons for context.")
         except Exception as e:
             logger.exception(f"Error during FAISS search: {e}")
     elif not current_lessons_text:
         logger.info("No current lessons provided to find context for.")
-    else: # index.ntotal == 0
-        logger.info("FAISS index is empty. No past lessons to search for context.")
+    else: # index.ntotal == 0, or encoding the lessons failed above
+        logger.info("FAISS index is empty or lessons could not be encoded. No past lessons to search for context.")
 
     # Update FAISS Index and Past Lessons Store with current_lessons_text
-    if current_lessons_text:
+    if current_lesson_embeddings is not None:
         logger.info(f"Updating FAISS index and lesson store with {len(current_lessons_text)} new lessons.")
         try:
-            new_embeddings_to_add = sentence_model.encode(current_lessons_text)
-            index.add(numpy.array(new_embeddings_to_add).astype(numpy.float32))
+            index.add(current_lesson_embeddings)
             past_lessons_data.extend(current_lessons_text) # Add new lessons to the list
 
+            if len(past_lessons_data) > _MAX_PAST_LESSONS:
+                # Evict down to 90% of the cap in one sweep so the rebuild
+                # amortizes over many episodes instead of firing per run.
+                # Embeddings for the kept lessons come from the persistent
+                # cache, so the rebuild is mostly hash lookups.
+                keep_from = len(past_lessons_data) - int(_MAX_PAST_LESSONS * 0.9)
+                evicted = keep_from
+                past_lessons_data = past_lessons_data[keep_from:]
+                from embedding_cache import get_or_compute
+                kept_embeddings = get_or_compute(past_lessons_data, sentence_model)
+                faiss.normalize_L2(kept_embeddings)
+                index = faiss.IndexFlatIP(embedding_dimension)
+                index.add(kept_embeddings)
+                logger.info(f"Evicted {evicted} oldest lessons; store rebuilt with {index.ntotal} vectors.")
+
+            index = _maybe_upgrade_index(index, embedding_dimension)
+
             # Ensure directories exist before writing
             faiss_dir = os.path.dirname(faiss_index_path)
             json_dir = os.path.dirname(past_lessons_json_path)
@@ -227,8 +388,12 @@ def build_context(current_lessons_text: list[str], sentence_model, faiss_index_p
             if json_dir: os.makedirs(json_dir, exist_ok=True)
 
             faiss.write_index(index, faiss_index_path)
-            with open(past_lessons_json_path, 'w') as f:
-                json.dump(past_lessons_data, f, indent=2)
+            if orjson is not None:
+                with open(past_lessons_json_path, 'wb') as f:
+                    f.write(orjson.dumps(past_lessons_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(past_lessons_json_path, 'w') as f:
+                    json.dump(past_lessons_data, f, indent=2)
             logger.info(f"FAISS index saved to {faiss_index_path} (new total: {index.ntotal}). Past lessons saved to {past_lessons_json_path}.")
         except Exception as e:
             logger.exception(f"Error updating FAISS index or past lessons store: {e}")
@@ -239,9 +404,11 @@ def build_context(current_lessons_text: list[str], sentence_model, faiss_index_p
 
 
 if __name__ == '__main__':
+    import faiss # Used directly by the index-inspection checks below
+
     # Configure basic logging for direct script execution/testing
     logging.basicConfig(
-        level=logging.INFO, 
+        level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
@@ -2,6 +2,12 @@ import feedparser
 import json
 import os
 import logging
+import config # For atomic_write_text
+
+try:
+    import orjson # C-accelerated; the processed-ID list grows per episode
+except ImportError:
+    orjson = None
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -25,30 +31,64 @@ def fetch_latest_episode(feed_url: str, processed_json_path: str) -> tuple[str |
 
     if os.path.exists(processed_json_path):
         try:
-            with open(processed_json_path, 'r') as f:
-                processed_episode_ids = set(json.load(f))
+            with open(processed_json_path, 'rb') as f:
+                raw = f.read()
+            processed_episode_ids = set(orjson.loads(raw) if orjson is not None else json.loads(raw))
             logger.info(f"Loaded {len(processed_episode_ids)} processed episode IDs from {processed_json_path}")
         except (json.JSONDecodeError, IOError) as e: # Catch both JSON and IO errors for reading
             logger.exception(f"Error reading or decoding {processed_json_path}. Starting with an empty set. Error: {e}")
             # Ensure directory exists in case the file was corrupt/empty and needs to be rewritten
-            if processed_json_dir and not os.path.exists(processed_json_dir):
+            if processed_json_dir:
                 try:
-                    os.makedirs(processed_json_dir)
+                    os.makedirs(processed_json_dir, exist_ok=True)
                 except OSError as dir_e:
                     logger.exception(f"Could not create directory {processed_json_dir} for processed episodes file: {dir_e}")
                     return None, None # Cannot proceed if we can't ensure directory
     else:
         logger.info(f"No processed episodes file found at {processed_json_path}. Starting fresh.")
         # Ensure directory for processed_json_path exists
-        if processed_json_dir and not os.path.exists(processed_json_dir):
+        if processed_json_dir:
             try:
-                os.makedirs(processed_json_dir)
-                logger.info(f"Created directory for processed episodes file: {processed_json_dir}")
+                os.makedirs(processed_json_dir, exist_ok=True)
             except OSError as e:
                 logger.exception(f"Could not create directory {processed_json_dir} for processed episodes file: {e}")
                 return None, None # Cannot proceed if we can't create directory
 
-    feed = feedparser.parse(feed_url)
+    # Conditional fetch: replay the ETag/Last-Modified from the previous
+    # poll so an unchanged feed answers 304 with no XML body to download or
+    # parse — the common case for frequent polling.
+    feed_meta_path = os.path.join(processed_json_dir or '.', 'feed_meta.json')
+    saved_etag = saved_modified = None
+    try:
+        with open(feed_meta_path, 'r', encoding='utf-8') as f:
+            feed_meta = json.load(f)
+        saved_etag = feed_meta.get('etag')
+        saved_modified = feed_meta.get('modified')
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    feed = feedparser.parse(feed_url, etag=saved_etag, modified=saved_modified)
+
+    if getattr(feed, 'status', None) == 304:
+        logger.info(f"Feed at {feed_url} unchanged since last poll (304). No new episodes.")
+        return None, None
+
+    def _save_feed_meta():
+        # Only called once a parse leaves no unprocessed entries: this
+        # function returns a single episode per call, so recording the etag
+        # any earlier would make the next call 304-short-circuit while
+        # later entries (and backfill_feed's repeated calls) still have
+        # episodes to hand out.
+        new_etag = feed.get('etag')
+        new_modified = feed.get('modified')
+        if new_etag or new_modified:
+            try:
+                config.atomic_write_text(
+                    feed_meta_path,
+                    json.dumps({'etag': new_etag, 'modified': new_modified})
+                )
+            except OSError as e:
+                logger.warning(f"Could not persist feed ETag metadata: {e}")
 
     if feed.bozo:
         # feed.bozo is 1 if the feed is not well-formed XML, 0 otherwise.
@@ -58,6 +98,7 @@ def fetch_latest_episode(feed_url: str, processed_json_path: str) -> tuple[str |
 
     if not feed.entries:
         logger.info(f"No entries found in the RSS feed at {feed_url}.")
+        _save_feed_meta()
         return None, None
 
     logger.info(f"Found {len(feed.entries)} entries in the feed from {feed_url}.")
@@ -81,8 +122,15 @@ def fetch_latest_episode(feed_url: str, processed_json_path: str) -> tuple[str |
                 
                 processed_episode_ids.add(episode_id)
                 try:
-                    with open(processed_json_path, 'w') as f:
-                        json.dump(list(processed_episode_ids), f, indent=4)
+                    # Write-temp-then-rename so a crash mid-write can never
+                    # leave a truncated processed.json behind (which would
+                    # cause every past episode to be re-downloaded).
+                    # No pretty-printing: only this code reads the file, and
+                    # indentation re-serializes the whole growing history
+                    # with extra bytes each episode. Sorted for stable diffs.
+                    ids = sorted(processed_episode_ids)
+                    payload = orjson.dumps(ids).decode() if orjson is not None else json.dumps(ids)
+                    config.atomic_write_text(processed_json_path, payload)
                     logger.info(f"Updated processed episodes file: {processed_json_path} with episode ID: {episode_id}")
                 except IOError as e:
                     logger.exception(f"Could not write updated list of processed episode IDs to {processed_json_path}: {e}")
@@ -99,6 +147,7 @@ def fetch_latest_episode(feed_url: str, processed_json_path: str) -> tuple[str |
             logger.debug(f"Episode '{entry.title}' (ID: {episode_id}) already processed. Skipping.")
 
     logger.info(f"No new, unprocessed episodes found in feed: {feed_url}.")
+    _save_feed_meta()
     return None, None
 
 if __name__ == '__main__':
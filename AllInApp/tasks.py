@@ -0,0 +1,272 @@
+import hashlib
+import os
+import logging
+from collections import deque
+
+import redis
+from celery import chain, group
+from celery.signals import worker_process_init
+
+import config
+from celery_utils import celery_app, REDIS_URL
+from main import (
+    get_diffusion_model, get_nlp_pipeline, get_sentence_model,
+    render_show_art_cached, run_pipeline, transcribe_episode_audio
+)
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+class _DequeLogHandler(logging.Handler):
+    """
+    Collects formatted log records into a bounded deque. Replaces the old
+    sys.stdout -> StringIO swap: appends are O(1) instead of growing one
+    ever-larger string, memory is capped at maxlen lines, and nothing
+    process-global is monkeypatched (two tasks in one worker process used
+    to race over sys.stdout).
+    """
+    def __init__(self, maxlen: int = 5000):
+        super().__init__()
+        self.lines = deque(maxlen=maxlen)
+        self.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    def emit(self, record):
+        try:
+            self.lines.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def getvalue(self) -> str:
+        return '\n'.join(self.lines)
+
+class _RedisLogHandler(logging.Handler):
+    """
+    Publishes each formatted log record to the task's Redis event channel so
+    the GUI's SSE stream shows pipeline logs live, line by line, instead of
+    the user staring at a blank page until the whole run finishes. Publish
+    failures are swallowed via handleError — logging must never take down
+    the pipeline.
+    """
+    def __init__(self, task_id: str):
+        super().__init__()
+        self.channel = f"task_events:{task_id}"
+        self.client = redis.Redis.from_url(REDIS_URL)
+        self.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    def emit(self, record):
+        try:
+            self.client.publish(self.channel, f"LOG: {self.format(record)}")
+        except Exception:
+            self.handleError(record)
+
+@worker_process_init.connect
+def prewarm_models(**kwargs):
+    """
+    Loads the NLP, sentence-embedding, and diffusion models into main's
+    per-process caches when a worker child starts, so the first dispatched
+    pipeline task doesn't pay the multi-GB model load. Workers serving only
+    the transcription queue should export PREWARM_MODELS=0 to skip it.
+    """
+    if os.getenv('PREWARM_MODELS', '1') != '1':
+        return
+    for loader in (get_nlp_pipeline, get_sentence_model, get_diffusion_model):
+        try:
+            if loader() is None:
+                loader.cache_clear()
+                logger.warning(f"Pre-warm: {loader.__name__} returned no model.")
+        except Exception as e:
+            logger.warning(f"Pre-warm of {loader.__name__} failed: {e}")
+
+# Single-flight lock key for the monolithic pipeline task. The GUI acquires
+# it (SET NX) before dispatching; the task releases it when done. The expiry
+# is a dead-worker safety net, not the normal release path.
+PIPELINE_LOCK_KEY = 'pipeline_run_lock'
+PIPELINE_LOCK_TTL = 2 * 60 * 60
+
+def release_pipeline_lock(task_id: str):
+    """
+    Releases the single-flight lock, but only if this task still owns it —
+    after a TTL expiry another run may have taken the lock, and deleting
+    theirs would let a third run start alongside it.
+    """
+    try:
+        client = redis.Redis.from_url(REDIS_URL)
+        owner = client.get(PIPELINE_LOCK_KEY)
+        if owner is not None and owner.decode() == task_id:
+            client.delete(PIPELINE_LOCK_KEY)
+    except redis.RedisError as e:
+        logger.warning(f"Could not release pipeline lock for {task_id}: {e}")
+
+def _publish_task_event(task_id: str, payload: str):
+    """
+    Publishes a task state-change event to the Redis channel subscribed to by
+    the GUI's SSE endpoint (see gui.pipeline_stream_route). Failures here are
+    logged but never allowed to break the pipeline task itself.
+    """
+    try:
+        client = redis.Redis.from_url(REDIS_URL)
+        client.publish(f"task_events:{task_id}", payload)
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish task event for {task_id}: {e}")
+
+# --- Chained per-phase tasks ---------------------------------------------
+# Unlike execute_podcast_pipeline below, each phase is its own task: a failed
+# phase retries alone instead of re-running the whole pipeline, multiple
+# episodes can be in flight across workers, and the transcription phase can
+# be routed to its own queue (see task_routes in celery_utils.py).
+
+@celery_app.task
+def fetch_rss():
+    """Phase 1: returns {'audio_url', 'episode_title'} or None when no new episode."""
+    from rss_feed import fetch_latest_episode
+    config.ensure_dirs()
+    audio_url, episode_title = fetch_latest_episode(config.RSS_FEED_URL, config.PROCESSED_JSON)
+    if not audio_url or not episode_title:
+        logger.info("No new episode found; downstream phases will be skipped.")
+        return None
+    return {'audio_url': audio_url, 'episode_title': episode_title}
+
+@celery_app.task
+def download_audio(episode):
+    """Phase 2: downloads/converts the episode audio; adds 'wav_path'."""
+    if episode is None:
+        return None
+    from audio_processing import process_audio
+    wav_path = process_audio(episode['audio_url'], episode.get('wav_target', config.LATEST_AUDIO_WAV))
+    if not wav_path:
+        raise RuntimeError(f"Audio processing failed for '{episode['episode_title']}'")
+    episode['wav_path'] = wav_path
+    return episode
+
+@celery_app.task
+def transcribe(episode):
+    """Phase 3: transcribes the WAV; adds 'transcript_path'."""
+    if episode is None:
+        return None
+    transcript_path = transcribe_episode_audio(
+        episode['wav_path'],
+        episode.get('transcript_target', config.TRANSCRIPT_TXT),
+    )
+    if not transcript_path:
+        raise RuntimeError(f"Transcription failed for '{episode['episode_title']}'")
+    episode['transcript_path'] = transcript_path
+    return episode
+
+@celery_app.task
+def generate_art(episode):
+    """Phase 4: renders show art on the gpu queue; adds 'show_art_path'."""
+    if episode is None:
+        return None
+    prompt = (
+        f"Podcast show art for an episode titled: '{episode['episode_title']}'. "
+        "Style: vibrant, abstract, tech-themed, digital art."
+    )
+    art_path = render_show_art_cached(prompt, episode.get('art_target', config.SHOW_ART_JPG))
+    if not art_path:
+        raise RuntimeError(f"Show art generation failed for '{episode['episode_title']}'")
+    episode['show_art_path'] = art_path
+    return episode
+
+@celery_app.task
+def backfill_feed(max_episodes: int = 4):
+    """
+    Fans out download+transcribe chains for up to max_episodes unprocessed
+    episodes. Each episode's work is an independent network download plus
+    ffmpeg decode, so a group() lets the worker pool run them in parallel
+    instead of serially. Per-episode output paths keep parallel runs from
+    overwriting each other.
+
+    Returns:
+        The number of episodes dispatched.
+    """
+    from rss_feed import fetch_latest_episode
+    config.ensure_dirs()
+
+    episodes = []
+    for _ in range(max_episodes):
+        # Each call marks its episode processed, so repeated calls walk
+        # through the feed's backlog of new episodes.
+        audio_url, episode_title = fetch_latest_episode(config.RSS_FEED_URL, config.PROCESSED_JSON)
+        if not audio_url or not episode_title:
+            break
+        key = hashlib.blake2b(audio_url.encode(), digest_size=6).hexdigest()
+        wav_base, wav_ext = os.path.splitext(config.LATEST_AUDIO_WAV)
+        txt_base, txt_ext = os.path.splitext(config.TRANSCRIPT_TXT)
+        episodes.append({
+            'audio_url': audio_url,
+            'episode_title': episode_title,
+            'wav_target': f"{wav_base}_{key}{wav_ext}",
+            'transcript_target': f"{txt_base}_{key}{txt_ext}",
+        })
+
+    if not episodes:
+        logger.info("No new episodes to backfill.")
+        return 0
+
+    group(chain(download_audio.s(ep), transcribe.s()) for ep in episodes).apply_async()
+    logger.info(f"Dispatched {len(episodes)} episode chains for parallel processing.")
+    return len(episodes)
+
+def run_pipeline_chain():
+    """
+    Dispatches the fetch -> download -> transcribe -> art chain and returns
+    its AsyncResult. Show art runs on the gpu queue (see task_routes), so
+    GPU memory stays pinned in one dedicated worker instead of whichever
+    process happens to execute the pipeline. The NLP phase still runs via
+    execute_podcast_pipeline until main's step bodies are factored into
+    callable units.
+    """
+    return chain(
+        fetch_rss.s(), download_audio.s(), transcribe.s(), generate_art.s()
+    ).apply_async()
+
+# --- Monolithic pipeline task (used by the GUI) ---------------------------
+
+@celery_app.task(bind=True)
+def execute_podcast_pipeline(self):
+    """
+    Celery task wrapping run_pipeline. Collects the pipeline's log output
+    for the GUI, reports PROGRESS state transitions, and publishes each
+    transition to Redis pub/sub for the SSE stream.
+
+    Returns:
+        A dict with 'status' and the collected 'output' text (bounded to
+        the most recent lines).
+    """
+    task_id = self.request.id
+
+    def _progress(step_description):
+        self.update_state(state='PROGRESS', meta={'step': step_description})
+        _publish_task_event(task_id, f'PROGRESS: {step_description}')
+
+    # Relay every pipeline log line to the SSE channel and collect a bounded
+    # copy for the task result; both detached in the finally block below.
+    log_handler = _RedisLogHandler(task_id)
+    output_handler = _DequeLogHandler()
+    logging.getLogger().addHandler(log_handler)
+    logging.getLogger().addHandler(output_handler)
+
+    # Tracked locally so the finally block doesn't need a result-backend
+    # round-trip just to learn what this function already knows.
+    reached_terminal_state = False
+    try:
+        _progress('Pipeline starting')
+
+        run_pipeline(progress_callback=_progress)
+
+        _publish_task_event(task_id, 'SUCCESS: Pipeline finished')
+        reached_terminal_state = True
+        return {'status': 'Pipeline finished', 'output': output_handler.getvalue()}
+    except Exception as e:
+        logger.exception(f"Pipeline task {task_id} failed: {e}")
+        _publish_task_event(task_id, f'FAILURE: {e}')
+        reached_terminal_state = True # Celery records the FAILURE from the re-raise
+        raise
+    finally:
+        logging.getLogger().removeHandler(log_handler)
+        logging.getLogger().removeHandler(output_handler)
+        release_pipeline_lock(task_id)
+        # Safety net: if the task somehow exits while still marked PROGRESS
+        # (e.g. revoked mid-run), surface that rather than leaving a stale state.
+        if not reached_terminal_state:
+            logger.warning(f"Task {task_id} exiting while still in PROGRESS state.")
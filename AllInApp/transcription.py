@@ -2,6 +2,10 @@ import subprocess
 import os
 import logging
 import shutil # For robust file moving
+import threading
+from collections import deque
+
+import config # For WHISPER_THREADS
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
@@ -38,7 +42,11 @@ def transcribe_audio(wav_file_path: str, transcript_output_path: str, whisper_ex
         "-m", os.path.abspath(whisper_model_path), # Ensure model path is absolute
         "-f", os.path.abspath(wav_file_path),
         "-otxt",
-        "-nt" # No timestamps
+        "-nt", # No timestamps
+        "-pp", # Print progress so the streamed log shows how far along we are
+        # whisper.cpp defaults to 4 threads; use every core on bigger hosts
+        # (override with WHISPER_THREADS when sharing the box).
+        "-t", str(getattr(config, 'WHISPER_THREADS', None) or os.cpu_count() or 4)
     ]
 
     logger.info(f"Executing Whisper.cpp command: {' '.join(command)}")
@@ -49,18 +57,47 @@ def transcribe_audio(wav_file_path: str, transcript_output_path: str, whisper_ex
 
 
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=False, cwd=whisper_cwd, timeout=300) # Added timeout (5 mins)
-
-        if result.returncode != 0:
-            logger.error(f"Whisper.cpp transcription failed for {wav_file_path} with return code {result.returncode}")
-            logger.error(f"Whisper.cpp stderr:\n{result.stderr}")
-            logger.error(f"Whisper.cpp stdout:\n{result.stdout}")
+        # Stream output line-by-line instead of buffering it all in memory
+        # with capture_output: transcription is the longest step, and
+        # forwarding each line as it appears means progress shows up in the
+        # logs (and the GUI's SSE stream) live. stderr is merged so whisper's
+        # progress prints arrive on the same pipe; a small tail is kept for
+        # the failure report. The relay runs on its own thread so the
+        # 5-minute cap below sits on process.wait() itself — a child that
+        # hangs while emitting nothing (stuck model load, driver stall) is
+        # killed just like the old subprocess.run(timeout=300) guaranteed.
+        output_tail = deque(maxlen=50)
+
+        def _relay_output(pipe):
+            try:
+                for line in pipe:
+                    line = line.rstrip()
+                    if line:
+                        logger.info(f"whisper.cpp: {line}")
+                        output_tail.append(line)
+            except (OSError, ValueError):
+                pass # pipe closed by the kill path below
+
+        with subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1, cwd=whisper_cwd
+        ) as process:
+            relay = threading.Thread(target=_relay_output, args=(process.stdout,), daemon=True)
+            relay.start()
+            try:
+                returncode = process.wait(timeout=300) # 5 min hard cap, as before
+            except subprocess.TimeoutExpired:
+                process.kill()
+                raise
+            finally:
+                relay.join(timeout=5)
+
+        if returncode != 0:
+            logger.error(f"Whisper.cpp transcription failed for {wav_file_path} with return code {returncode}")
+            logger.error("Whisper.cpp output (last lines):\n" + "\n".join(output_tail))
             return None
-        
+
         logger.info(f"Whisper.cpp executed successfully for {wav_file_path}.")
-        # Log first few lines of stdout for context, if any significant output is expected beyond status
-        if result.stdout.strip():
-             logger.debug(f"Whisper.cpp stdout (first 200 chars):\n{result.stdout.strip()[:200]}")
 
 
         # Primary assumption: output file is wav_file_path + ".txt"
@@ -85,10 +122,10 @@ def transcribe_audio(wav_file_path: str, transcript_output_path: str, whisper_ex
             logger.info(f"Found generated transcript at: {generated_transcript_path_in_process_cwd}")
 
         target_transcript_dir = os.path.dirname(transcript_output_path)
-        if target_transcript_dir and not os.path.exists(target_transcript_dir):
+        if target_transcript_dir:
             try:
+                # exist_ok makes the pre-check stat redundant.
                 os.makedirs(target_transcript_dir, exist_ok=True)
-                logger.info(f"Created target directory for transcript: {target_transcript_dir}")
             except OSError as e:
                 logger.exception(f"OSError creating target directory {target_transcript_dir} for transcript: {e}")
                 return None
@@ -0,0 +1,79 @@
+import logging
+
+import config
+
+try:
+    from faster_whisper import WhisperModel # CTranslate2 backend; optional
+except ImportError:
+    WhisperModel = None
+
+# Configure logger for this module
+logger = logging.getLogger(__name__)
+
+# Model loaded once per process and reused across episodes — the whole point
+# of this backend over the whisper.cpp subprocess is not re-paying model
+# setup per invocation.
+_MODEL = None
+
+def _get_model():
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = WhisperModel(
+            config.FASTER_WHISPER_MODEL,
+            device="auto",
+            compute_type=config.FASTER_WHISPER_COMPUTE_TYPE,
+        )
+        logger.info(
+            f"Loaded faster-whisper model '{config.FASTER_WHISPER_MODEL}' "
+            f"(compute_type={config.FASTER_WHISPER_COMPUTE_TYPE})."
+        )
+    return _MODEL
+
+def transcribe_audio(wav_file_path: str | None, transcript_output_path: str, samples=None) -> str | None:
+    """
+    Transcribes an audio file with faster-whisper (CTranslate2, int8 by
+    default) and saves the transcript. In-process alternative to
+    transcription.transcribe_audio: the model stays resident between
+    episodes and quantized inference is typically 2-4x faster on CPU than
+    the whisper.cpp subprocess.
+
+    Args:
+        wav_file_path: Path to the input WAV audio file; may be None when
+            samples is given.
+        transcript_output_path: Path to save the final transcript text file.
+        samples: Optional in-memory audio — a 1-D float32 array of mono
+            16kHz samples (audio_processing.process_audio_to_array's output).
+            When provided it is transcribed directly, skipping the WAV file.
+
+    Returns:
+        The path to the saved transcript file if successful, None otherwise.
+    """
+    if WhisperModel is None:
+        logger.error(
+            "faster-whisper is not installed but TRANSCRIPTION_BACKEND requests it. "
+            "Install it (pip install faster-whisper) or unset the backend."
+        )
+        return None
+
+    source = samples if samples is not None else wav_file_path
+    logger.info(f"Starting faster-whisper transcription for: {wav_file_path or 'in-memory PCM'}")
+    try:
+        segments, info = _get_model().transcribe(
+            source, beam_size=1, vad_filter=True
+        )
+        # segments is a lazy generator; iteration drives the actual decode.
+        lines = []
+        for segment in segments:
+            text = segment.text.strip()
+            if text:
+                logger.info(f"faster-whisper [{segment.start:7.1f}s]: {text}")
+                lines.append(text)
+        config.atomic_write_text(transcript_output_path, '\n'.join(lines) + '\n')
+        logger.info(
+            f"faster-whisper transcription finished ({info.language}, "
+            f"{info.duration:.0f}s audio). Transcript saved to: {transcript_output_path}"
+        )
+        return transcript_output_path
+    except Exception as e:
+        logger.exception(f"faster-whisper transcription failed for {wav_file_path}: {e}")
+        return None
@@ -59,5 +59,5 @@ echo "✓ Whisper.cpp compiled"
 echo "✓ Whisper base English model downloaded"
 echo "✓ Directory structure created"
 echo ""
-echo "You can now run the pipeline with: python3 main.py"
+echo "You can now run the pipeline with: python3 AllInApp/main.py"
 echo ""